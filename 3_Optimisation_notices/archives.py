@@ -0,0 +1,63 @@
+import os, tarfile, threading, zipfile
+from functools import partial
+
+# Notices lues directement dans une archive (.zip, .tar, .tar.gz, .tar.zst…), sans extraction sur disque.
+#   - zip : chaque membre est compressé séparément ; seule la liste des membres est lue au départ,
+#     la décompression se fait à l'étape de lecture du pipeline, par plusieurs workers en parallèle ;
+#   - tar : l'archive est un flux unique, décompressé au fil de l'eau dans l'ordre des membres
+#     (.tar.zst via le module zstandard).
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar.zst", ".tar.zstd")
+ZSTD_SUFFIXES = (".zst", ".zstd")
+
+def is_archive(path):
+    return path.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES) and os.path.isfile(path)
+
+class ZipMembers:
+    def __init__(self, path):
+        self.path = path
+        # Un ZipFile par thread : les lectures d'un même descripteur seraient sérialisées
+        self._local = threading.local()
+
+    def names(self):
+        with zipfile.ZipFile(self.path) as archive:
+            return [info.filename for info in archive.infolist() if not info.is_dir()]
+
+    def read(self, name):
+        archive = getattr(self._local, "archive", None)
+        if archive is None:
+            archive = self._local.archive = zipfile.ZipFile(self.path)
+        return archive.read(name).decode("utf-8")
+
+def _tar_stream(raw, path):
+    if path.lower().endswith(ZSTD_SUFFIXES):
+        import zstandard
+
+        return zstandard.ZstdDecompressor().stream_reader(raw)
+    return raw
+
+# Séparateur des dossiers d'un membre dans le nom du fichier de sortie
+MEMBER_SEPARATOR = "__"
+
+def member_name(member):
+    # Chemin relatif du membre aplati en un nom de fichier ("a/b/notice.json" -> "a__b__notice.json") :
+    # deux membres de même nom dans des dossiers différents restent distincts, et ni "..",
+    # ni un chemin absolu ne permettent d'écrire hors du dossier de sortie
+    parts = [part for part in member.replace("\\", "/").split("/") if part not in ("", ".", "..")]
+    return MEMBER_SEPARATOR.join(parts)
+
+def iter_members(path):
+    # (nom du membre, texte ou fonction de lecture différée) pour chaque fichier de l'archive
+    if path.lower().endswith(ZIP_SUFFIXES):
+        members = ZipMembers(path)
+        for name in members.names():
+            yield name, partial(members.read, name)
+        return
+
+    with open(path, "rb") as raw:
+        # "r|*" : lecture en flux, compression gzip/bz2/xz détectée par tarfile
+        with tarfile.open(fileobj=_tar_stream(raw, path), mode="r|*") as archive:
+            for member in archive:
+                if member.isfile():
+                    yield member.name, archive.extractfile(member).read().decode("utf-8")
@@ -0,0 +1,100 @@
+import json, os, random, uuid
+
+# Générateurs de notices synthétiques aux formats des trois sources
+
+TITLES = ["Vase", "Bol", "Coupe", "Plat", "Théière", "Brûle-parfum", "Paravent", "Rouleau", "Statuette", "Boîte"]
+MATERIALS = ["porcelaine", "bronze", "jade", "soie", "bois", "laque", "ivoire", "papier", "céramique", "argent"]
+PERIODS = ["vers 1600", "1600 / 1700  (XVIIe siècle)", "XVIIIe siècle", "Dynastie Qing", "1ère moitié du 18e siècle",
+           "Kangxi (1661-1722)", "Ming (1368-1644)", "19e siècle", "2e moitié du XVIIe siècle", "Qianlong (1736-1795)"]
+CREATORS = ["Anonyme", "Atelier impérial", "Lang Shining", "Castiglione, Giuseppe", "Jingdezhen"]
+LOUVRE_COLLECTIONS = ["Département des Objets d'art du Moyen Age, de la Renaissance et des temps modernes",
+                      "Département des Arts graphiques", "Service de l'Histoire du Louvre"]
+LOUVRE_LOCATIONS = ["non exposé", "Richelieu, [OArt] Salle 527", "Sully, salle 602", "Denon, salle 706"]
+PARIS_MUSEUMS = ["Musée Cernuschi, musée des Arts de l'Asie de la Ville de Paris",
+                 "Petit Palais, musée des Beaux-arts de la Ville de Paris", "Maison de Balzac"]
+AGORHA_LOCATIONS = ["Musée Guimet", "Musée du Louvre", "BnF", "Localisation inconnue"]
+TRANSFERS = ["don", "legs", "achat", "saisie révolutionnaire"]
+DONORS = ["Guimet, Émile", "Grandidier, Ernest", "Cernuschi, Henri", "Dutuit, Auguste et Eugène"]
+
+def louvre_notice(rng, index):
+    ark = f"cl{10000000 + index:09d}"
+    start = rng.randint(1368, 1900)
+    return ark, {
+        "url": f"https://collections.louvre.fr/ark:/53355/{ark}",
+        "title": f"{rng.choice(TITLES)} {index}",
+        "objectNumber": [{"value": f"OA {index}"}],
+        "dateCreated": [{"text": rng.choice(PERIODS), "startYear": start, "endYear": start + rng.randint(0, 100)}],
+        "placeOfCreation": "Lieu de création : Chine",
+        "creator": [{"label": rng.choice(CREATORS)}],
+        "collection": rng.choice(LOUVRE_COLLECTIONS),
+        "dimension": [{"displayDimension": f"H. : {rng.uniform(2, 80):.1f} cm".replace(".", ",")},
+                      {"displayDimension": f"l. : {rng.randint(20, 600)} mm"}],
+        "materialsAndTechniques": f"Matériau : {rng.choice(MATERIALS)}, {rng.choice(MATERIALS)}\nTechnique : peint",
+        "description": "Notice synthétique.",
+        "ownedBy": "Etat",
+        "heldBy": "Musée du Louvre",
+        "longTermLoanTo": rng.choice(["", "Musée Guimet"]),
+        "currentLocation": rng.choice(LOUVRE_LOCATIONS),
+        "acquisitionDetails": [{"mode": rng.choice(TRANSFERS), "dates": [{"startYear": 1900, "endYear": 1900}]}],
+        "previousOwner": [{"value": rng.choice(DONORS)}],
+        "exhibition": [],
+    }
+
+def agorha_notice(rng, index):
+    uid = str(uuid.UUID(int=rng.getrandbits(128)))
+    return uid, {
+        "@id": f"https://agorha.inha.fr/ark:/54721/{uid}",
+        "crm:P102_has_title": {"rdfs:label": {"@value": f"{rng.choice(TITLES)} {index}"}},
+        "crm:P54_has_current_permanent_location": {
+            "crm:P87_is_identified_by": {"crm:P1_is_identified_by": {"crm:P87_is_identified_by": {"rdfs:label": rng.choice(AGORHA_LOCATIONS)}}}
+        },
+        "crm:P108i_was_produced_by": [
+            {"crm:P14_carried_out_by": {"rdfs:label": rng.choice(CREATORS)},
+             "crm:P7_took_place_at": {"crm:P1_is_identified_by": {"crm:P87_is_identified_by": {"rdfs:label": "Chine"}}}},
+            {"crm:P4_has_time-span": {"crm:P115_finishes": {"crm:P78_is_identified_by": {"crm:P1_is_identified_by": {"rdfs:label": {"@value": rng.choice(PERIODS)}}}}}},
+        ],
+        "crm:P43_has_dimension": [{"crm:P90_has_value": f"{rng.uniform(2, 80):.1f}", "crm:P91_has_unit": {"rdfs:label": "cm"}}],
+        "crm:P34_concerned": {"crm:P45_consists_of": {"crm:P1_is_identified_by": [{"rdfs:label": {"@value": m}} for m in rng.sample(MATERIALS, 2)]}},
+        "crm:P67i_is_referred_to_by": [{"crm:P3_has_note": {"@value": "Notice synthétique."}},
+                                       {"crm:P51_has_former_or_current_owner": {"rdfs:label": "Musée du Louvre"}}],
+        "crm:P24i_changed_ownership_through": [{"crm:P67_refers_to": {"rdfs:label": f"Collection {rng.choice(DONORS)}"}}, {},
+                                               {"crm:P67_refers_to": {"rdfs:label": rng.choice(TRANSFERS)}}],
+    }
+
+def paris_musees_notice(rng, index):
+    uid = str(uuid.UUID(int=rng.getrandbits(128)))
+    start = rng.randint(1368, 1900)
+    return uid, {
+        "entityUuid": uid,
+        "title": f"{rng.choice(TITLES)} {index}",
+        "absolutePath": f"https://www.parismuseescollections.paris.fr/node/{index}",
+        "fieldDateProduction": {"startYear": start, "endYear": start + rng.randint(0, 100)},
+        "fieldOeuvreSiecle": {"entity": {"entityLabel": rng.choice(["17e siècle", "18e siècle", "1ère moitié du 18e siècle"])}},
+        "fieldOeuvreNumInventaire": f"M.C. {index}",
+        "fieldOeuvreDimensions": [
+            {"entity": {"fieldDimensionUnite": {"entity": {"entityLabel": "cm"}}, "fieldDimensionType": {"entity": {"entityLabel": "Hauteur"}}, "fieldDimensionValeur": round(rng.uniform(2, 80), 1)}},
+            {"entity": {"fieldDimensionUnite": {"entity": {"entityLabel": "cm"}}, "fieldDimensionType": {"entity": {"entityLabel": "Largeur"}}, "fieldDimensionValeur": round(rng.uniform(2, 80), 1)}},
+        ],
+        "fieldOeuvreDescriptionIcono": {"value": "Notice synthétique."},
+        "queryFieldMusee": {"entities": [{"entityLabel": rng.choice(PARIS_MUSEUMS)}]},
+        "queryFieldMateriauxTechnique": {"entities": [{"entityLabel": m.capitalize()} for m in rng.sample(MATERIALS, 2)]},
+        "queryFieldModaliteAcquisition": {"entities": [{"entityLabel": rng.choice(TRANSFERS)}]},
+        "queryFieldDonateurs": {"entities": [{"entityLabel": rng.choice(DONORS)}]},
+    }
+
+# source -> (générateur, extension du fichier)
+SOURCES = {
+    "louvre": (louvre_notice, ".json"),
+    "agorha": (agorha_notice, ".jsonld"),
+    "paris_musees": (paris_musees_notice, ".json"),
+}
+
+def write_corpus(directory, source, count, seed=0):
+    generator, extension = SOURCES[source]
+    rng = random.Random(f"{source}-{seed}")
+    os.makedirs(directory, exist_ok=True)
+    for index in range(count):
+        name, notice = generator(rng, index)
+        with open(os.path.join(directory, name + extension), "w", encoding="utf-8") as f:
+            json.dump(notice, f, ensure_ascii=False)
+    return directory
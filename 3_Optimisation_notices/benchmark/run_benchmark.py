@@ -0,0 +1,130 @@
+import json, os, resource, subprocess, sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+from generators import SOURCES, write_corpus
+from sparql_replay import RECORDED_RESPONSES, ReplayServer
+
+# Benchmark hors ligne : notices synthétiques + serveur SPARQL local rejouant des réponses enregistrées.
+# Chaque configuration (mode, taille) tourne dans un processus séparé pour mesurer la mémoire proprement.
+
+MODES = ("process_directory", "process_directory_mulithread")
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def prepare_data(workdir, size, seed=0):
+    # La taille totale est répartie entre les trois sources
+    directories = {}
+    share, rest = divmod(size, len(SOURCES))
+    for i, source in enumerate(SOURCES):
+        count = share + (1 if i < rest else 0)
+        directory = os.path.join(workdir, f"data_{size}", f"input_{source}")
+        if not os.path.isdir(directory) or len(os.listdir(directory)) != count:
+            write_corpus(directory, source, count, seed)
+        directories[source] = directory
+    return directories
+
+def run_worker(mode, directories, threads, hedge=None, crosswalk=False):
+    # Exécuté dans le sous-processus : les points d'accès SPARQL viennent de l'environnement
+    import transformation_optimisee as pipeline
+
+    if hedge is not None:
+        pipeline.HEDGED_LOOKUPS, pipeline.HEDGE_PERCENTILE = True, hedge
+    pipeline.CROSSWALK = crosswalk
+
+    # Latence par objet : durée des entrées du rapport d'exécution, depuis la prise en charge par la
+    # première étape (l'attente dans la file d'entrée du pipeline n'est pas comptée)
+    report = pipeline.RunReport()
+    normalizers = {
+        "agorha": pipeline.create_intermediate_representation_agorha,
+        "louvre": pipeline.create_intermediate_representation_louvre,
+        "paris_musees": pipeline.create_intermediate_representation_paris_musees,
+    }
+
+    start = time.perf_counter()
+    if mode == "process_directory":
+        for source, directory in directories.items():
+            pipeline.process_directory(directory, normalizers[source], source, report=report)
+    else:
+        # Un seul passage pour les trois sources (cache et workers partagés)
+        pipeline.process_directories(
+            [(directory, normalizers[source], source) for source, directory in directories.items()],
+            num_threads=threads, report=report,
+        )
+    elapsed = time.perf_counter() - start
+    latencies = [entry["duration"] for entry in report.files]
+
+    return {
+        "mode": mode,
+        "objects": len(latencies),
+        "seconds": round(elapsed, 3),
+        "objects_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(1000 * _percentile(latencies, 0.50), 2),
+        "p99_ms": round(1000 * _percentile(latencies, 0.99), 2),
+        # ru_maxrss est en kilo-octets sous Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "cache": pipeline.vocabulary_cache.stats(),
+    }
+
+def run_benchmark(sizes, modes, latency, jitter, error_rate, threads, workdir, responses, hedge=None, crosswalk=False):
+    server = ReplayServer(responses, latency, jitter, error_rate).start()
+    env = dict(os.environ,
+               GETTY_SPARQL_ENDPOINT=f"{server.url}/getty/sparql",
+               WIKIDATA_SPARQL_ENDPOINT=f"{server.url}/wikidata/sparql")
+    results = []
+    try:
+        for size in sizes:
+            directories = prepare_data(workdir, size)
+            for mode in modes:
+                with tempfile.TemporaryDirectory(dir=workdir) as rundir:
+                    completed = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--worker", mode,
+                         "--directories", json.dumps(directories), "--threads", str(threads)]
+                        + (["--hedge", str(hedge)] if hedge is not None else [])
+                        + (["--crosswalk"] if crosswalk else []),
+                        cwd=rundir, env=env, capture_output=True, text=True, check=True,
+                    )
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+                result["size"] = size
+                results.append(result)
+                print(f"{size:>8} {mode:<30} {result['objects_per_second']:>10} obj/s "
+                      f"p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  RSS {result['peak_rss_mb']:>7} Mo")
+    finally:
+        server.shutdown()
+    return results
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne de la transformation Linked Art")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--latency", type=float, default=0.05, help="latence simulée des points d'accès SPARQL (s)")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="part des requêtes Getty en erreur")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--hedge", nargs="?", type=float, const=0.95, metavar="PERCENTILE", help="recherches couvertes (Wikidata lancé si Getty tarde)")
+    parser.add_argument("--crosswalk", action="store_true", help="correspondance Wikidata -> Getty (réponses VALUES rejouées)")
+    parser.add_argument("--workdir", default=os.path.join(HERE, "bench_data"))
+    parser.add_argument("--responses", default=RECORDED_RESPONSES)
+    parser.add_argument("--output", help="écrire les résultats en JSON")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--directories", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, json.loads(args.directories), args.threads, args.hedge, args.crosswalk)))
+        sys.exit(0)
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = run_benchmark(args.sizes, args.modes, args.latency, args.jitter, args.error_rate,
+                            args.threads, os.path.abspath(args.workdir), args.responses, args.hedge, args.crosswalk)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,128 @@
+import json, os, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Serveur SPARQL local qui rejoue des réponses enregistrées (Getty et Wikidata)
+# avec une latence configurable, pour mesurer le pipeline sans réseau.
+
+RECORDED_RESPONSES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded_responses.json")
+
+_GETTY_LABEL_RE = re.compile(r'LCASE\(STR\(\?lab\)\)\s*=\s*"(.*?)"\s*\)')
+_WIKIDATA_LABEL_RE = re.compile(r'mwapi:search\s+"(.*?)"')
+_VALUES_RE = re.compile(r"VALUES\s+\?item\s*\{([^}]*)\}")
+
+def _bindings(variable, uri):
+    return {
+        "head": {"vars": [variable]},
+        "results": {"bindings": [{variable: {"type": "uri", "value": uri}}] if uri else []},
+    }
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _query(self):
+        params = parse_qs(urlparse(self.path).query)
+        if self.command == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            params.update(parse_qs(self.rfile.read(length).decode("utf-8")))
+        return (params.get("query") or [""])[0]
+
+    def _answer(self):
+        server = self.server
+        query = self._query()
+        path = urlparse(self.path).path
+
+        if path.startswith("/getty"):
+            match = _GETTY_LABEL_RE.search(query)
+            label = match.group(1).strip().lower() if match else ""
+            body = _bindings("subj", server.responses["getty"].get(label))
+        elif path.startswith("/wikidata") and _VALUES_RE.search(query):
+            # Correspondance QID -> identifiants Getty (requête VALUES groupée)
+            crosswalk = server.responses.get("crosswalk", {})
+            rows = []
+            for item in _VALUES_RE.search(query).group(1).split():
+                q = item.split(":")[-1]
+                row = {"item": {"type": "uri", "value": f"http://www.wikidata.org/entity/{q}"}}
+                row.update({prop: {"type": "literal", "value": value} for prop, value in crosswalk.get(q, {}).items()})
+                rows.append(row)
+            body = {"head": {"vars": ["item"]}, "results": {"bindings": rows}}
+        elif path.startswith("/wikidata"):
+            match = _WIKIDATA_LABEL_RE.search(query)
+            label = match.group(1).strip().lower() if match else ""
+            body = _bindings("item", server.responses["wikidata"].get(label))
+        else:
+            self.send_error(404)
+            return
+
+        time.sleep(server.delay())
+        with server.lock:
+            server.requests += 1
+            failed = path.startswith("/getty") and server.random.random() < server.error_rate
+            stalled = path.startswith("/getty") and server.random.random() < server.stall_rate
+        if stalled:
+            # Connexion Getty bloquée : seul le délai côté client y met fin
+            time.sleep(server.stall)
+        if failed:
+            # Panne simulée de Getty : le pipeline bascule sur Wikidata
+            self.send_error(503)
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _answer
+    do_POST = _answer
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, responses_path=RECORDED_RESPONSES, latency=0.05, jitter=0.0, error_rate=0.0, port=0, seed=0, stall_rate=0.0, stall=30.0):
+        super().__init__(("127.0.0.1", port), ReplayHandler)
+        with open(responses_path, encoding="utf-8") as f:
+            self.responses = json.load(f)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+
+    def delay(self):
+        with self.lock:
+            return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serveur SPARQL local rejouant des réponses enregistrées")
+    parser.add_argument("--port", type=int, default=8890)
+    parser.add_argument("--latency", type=float, default=0.05, help="latence simulée par requête (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="variation aléatoire de la latence (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="part des requêtes Getty en erreur (bascule Wikidata)")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="part des requêtes Getty bloquées")
+    parser.add_argument("--stall", type=float, default=30.0, help="durée d'une requête Getty bloquée (s)")
+    parser.add_argument("--responses", default=RECORDED_RESPONSES)
+    args = parser.parse_args()
+
+    server = ReplayServer(args.responses, args.latency, args.jitter, args.error_rate, args.port, stall_rate=args.stall_rate, stall=args.stall)
+    print(f"GETTY_SPARQL_ENDPOINT={server.url}/getty/sparql")
+    print(f"WIKIDATA_SPARQL_ENDPOINT={server.url}/wikidata/sparql")
+    server.serve_forever()
@@ -0,0 +1,125 @@
+import json, os, threading, time
+
+from vocab_cache import CACHE_FILE
+
+# Reprise après interruption (mémoire, préemption, Ctrl-C) : chaque notice écrite est ajoutée à un
+# journal (une ligne JSON par notice, fichier en ajout seul) ; une exécution relancée avec le même
+# dossier de sortie saute les notices déjà journalisées. Une notice est identifiée par son entrée
+# (dossier, archive ou export) et son nom : deux sources peuvent avoir des fichiers de même nom.
+# La ligne du journal porte aussi ce que la notice apporte au rapport d'exécution et au corpus, pour
+# que l'exécution reprise les restitue. Le journal est synchronisé sur disque par lots (fsync), et le
+# cache de vocabulaire est enregistré à intervalles réguliers à côté du journal, pour ne pas refaire
+# les recherches distantes déjà payées.
+# Les notices sont écrites dans un fichier temporaire, synchronisé puis renommé : une notice
+# journalisée est toujours complète sur disque.
+
+JOURNAL_FILE = "checkpoint.jsonl"
+# fsync après ce nombre de notices, ou après SYNC_INTERVAL secondes
+SYNC_EVERY = 64
+SYNC_INTERVAL = 1.0
+# Enregistrement du cache de vocabulaire (secondes)
+CACHE_INTERVAL = 60.0
+
+def write_file(path, text, sync=False):
+    # Fichier temporaire puis renommage ; sync : contenu sur disque avant le renommage
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as outfile:
+        outfile.write(text)
+        if sync:
+            outfile.flush()
+            os.fsync(outfile.fileno())
+    os.replace(tmp_path, path)
+
+def journal_key(origin, name):
+    return (os.path.abspath(origin) if origin else None, name)
+
+def read_journal(path):
+    # Lignes des notices déjà terminées ; une dernière ligne tronquée (arrêt brutal) est ignorée
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "file" in record:
+                records.append(record)
+    return records
+
+class Checkpoint:
+    def __init__(self, directory, cache=None, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL, cache_interval=CACHE_INTERVAL):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, JOURNAL_FILE)
+        self.cache = cache
+        self.cache_path = os.path.join(directory, CACHE_FILE)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.cache_interval = cache_interval
+        self.records = read_journal(self.path)
+        self.completed = {journal_key(r.get("input"), r["file"]) for r in self.records}
+        if cache is not None and os.path.exists(self.cache_path):
+            cache.load(self.cache_path)
+
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+        # Ligne incomplète laissée par un arrêt brutal : la suite du journal commence sur une nouvelle ligne
+        if self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+        self._pending = 0
+        self._last_sync = self._last_cache_save = time.monotonic()
+        self.recorded = 0
+
+    def __len__(self):
+        return len(self.completed)
+
+    def done(self, origin, name):
+        return journal_key(origin, name) in self.completed
+
+    def restore(self, report=None, corpus=None):
+        # Entrées du rapport et lignes du corpus des notices terminées avant l'interruption
+        for record in self.records:
+            if report is not None and record.get("entry") is not None:
+                report.add(record["entry"])
+            if corpus is not None and record.get("corpus") is not None:
+                corpus.append_row(record["corpus"])
+        self.records = []
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def record(self, origin, name, entry=None, row=None):
+        # Appelé une fois la notice écrite (renommée) dans le dossier de sortie et son entrée de rapport close
+        origin = os.path.abspath(origin) if origin else None
+        line = json.dumps({"input": origin, "file": name, "entry": entry, "corpus": row}, ensure_ascii=False) + "\n"
+        save_cache = False
+        with self._lock:
+            # Écrit tout de suite (survit à l'arrêt du processus) ; fsync par lots (survit à l'arrêt de la machine)
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            self.recorded += 1
+            now = time.monotonic()
+            if self._pending >= self.sync_every or now - self._last_sync >= self.sync_interval:
+                self._sync()
+            if self.cache is not None and now - self._last_cache_save >= self.cache_interval:
+                self._last_cache_save = now
+                save_cache = True
+        if save_cache:
+            self.cache.save(self.cache_path)
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
+        if self.cache is not None:
+            self.cache.save(self.cache_path)
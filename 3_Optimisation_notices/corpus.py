@@ -0,0 +1,103 @@
+import sys, threading
+
+from intermediate import NOT_FOUND_URI, NOT_SPECIFIED_URI
+
+# Colonnes du corpus (représentation intermédiaire aplatie)
+COLUMNS = (
+    "data_source", "id", "title", "inventory_number",
+    "creation_date", "beginning", "end",
+    "place_of_creation", "creator", "collection",
+    "width", "height", "length", "width_unit", "height_unit", "length_unit",
+    "materials", "owner", "current_permanent_custodian", "current_custodian",
+    "current_location", "mode_of_transfer", "previous_owner", "exhibition",
+    "unresolved_uris", "not_specified_uris",
+)
+
+# Colonnes de libellés très répétés : encodées en dictionnaire dans Arrow
+LABEL_COLUMNS = (
+    "data_source", "creation_date", "place_of_creation", "creator", "collection",
+    "width_unit", "height_unit", "length_unit", "owner", "current_permanent_custodian",
+    "current_custodian", "current_location", "mode_of_transfer", "previous_owner", "exhibition",
+)
+
+_LABEL_INDEXES = tuple(COLUMNS.index(name) for name in LABEL_COLUMNS)
+
+def _as_text(value):
+    return None if value is None else str(value)
+
+def _as_number(value):
+    return value if isinstance(value, (int, float)) else None
+
+def _count_uris(node, uri):
+    # Nombre d'identifiants égaux à `uri` dans un objet Linked Art
+    if isinstance(node, dict):
+        return (node.get("id") == uri) + sum(_count_uris(v, uri) for v in node.values() if isinstance(v, (dict, list)))
+    if isinstance(node, list):
+        return sum(_count_uris(v, uri) for v in node)
+    return 0
+
+class Corpus:
+    # Corpus en mémoire, stocké par colonnes, alimenté par les workers
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.columns = {name: [] for name in COLUMNS}
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def append(self, intermediate, linkedart=None):
+        acquisition = intermediate.changed_ownership_through
+        row = (
+            intermediate.data_source, intermediate.id, intermediate.title, _as_text(intermediate.inventory_number),
+            _as_text(intermediate.timespan.creation_date), _as_text(intermediate.timespan.beginning), _as_text(intermediate.timespan.end),
+            _as_text(intermediate.place_of_creation), intermediate.creator, intermediate.collection,
+            _as_number(intermediate.width), _as_number(intermediate.height), _as_number(intermediate.length),
+            intermediate.width_unit, intermediate.height_unit, intermediate.length_unit,
+            [m for m in intermediate.materials if m],
+            intermediate.owner, intermediate.current_permanent_custodian, intermediate.current_custodian,
+            intermediate.current_location,
+            acquisition.mode_of_transfer if acquisition else None,
+            acquisition.previous_owner if acquisition else None,
+            intermediate.exhibition,
+            _count_uris(linkedart, NOT_FOUND_URI) if linkedart else None,
+            _count_uris(linkedart, NOT_SPECIFIED_URI) if linkedart else None,
+        )
+        return self.append_row(row)
+
+    def append_row(self, row):
+        # Ligne déjà aplatie (ordre de COLUMNS), ex. relue dans le journal de reprise
+        # Libellés répétés d'une notice à l'autre : une seule chaîne en mémoire par valeur distincte
+        row = list(row)
+        for index in _LABEL_INDEXES:
+            if row[index].__class__ is str:
+                row[index] = sys.intern(row[index])
+        with self._lock:
+            for name, value in zip(COLUMNS, row):
+                self.columns[name].append(value)
+        return row
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        arrays = []
+        for name in COLUMNS:
+            values = self.columns[name]
+            if name == "materials":
+                array = pa.array(values, type=pa.list_(pa.string()))
+                array = pa.ListArray.from_arrays(array.offsets, array.flatten().dictionary_encode())
+            elif name in ("width", "height", "length"):
+                array = pa.array(values, type=pa.float64())
+            elif name in ("unresolved_uris", "not_specified_uris"):
+                array = pa.array(values, type=pa.int32())
+            else:
+                array = pa.array(values, type=pa.string())
+                if name in LABEL_COLUMNS:
+                    array = array.dictionary_encode()
+            arrays.append(array)
+        return pa.Table.from_arrays(arrays, names=list(COLUMNS))
+
+    def write_parquet(self, path):
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
+        return path
@@ -0,0 +1,214 @@
+import logging, re, sys, threading, time
+
+from instrumentation import metrics
+from report import note_error
+from vocab_cache import MISSING
+
+logger = logging.getLogger(__name__)
+
+# Correspondance Wikidata -> Getty : les URI Wikidata obtenues quand Getty n'a rien trouvé sont
+# remplacées par l'URI Getty du même concept, lue dans les identifiants externes de l'élément.
+# Les QID sont mis en file dès leur résolution (prefetch) et au départ pour ceux du cache de
+# vocabulaire, puis regroupés en requêtes VALUES ; l'étape de correspondance n'attend en général
+# qu'un lot déjà parti. Les correspondances sont gardées dans le cache de vocabulaire (clés "wd:Q…"),
+# enregistré avec --vocab-cache, fusionné par shards.merge_caches et relu à la reprise.
+
+# URI d'entité (…/entity/Q…) et de page (…/wiki/Q…, cas particuliers de transformation_optimisee)
+_QID_RE = re.compile(r"^https?://www\.wikidata\.org/(?:entity|wiki)/(Q\d+)$")
+CACHE_PREFIX = "wd:"
+
+# Propriétés d'identifiants Getty, par ordre de préférence
+GETTY_PROPERTIES = (
+    ("P1014", "http://vocab.getty.edu/aat/"),
+    ("P1667", "http://vocab.getty.edu/tgn/"),
+    ("P245", "http://vocab.getty.edu/ulan/"),
+)
+
+BATCH_SIZE = 200
+# Attente avant l'envoi d'un lot, pour y regrouper les QID des autres workers (secondes)
+BATCH_WINDOW = 0.05
+# Attente après un lot en échec avant de réinterroger Wikidata (secondes), doublée à chaque échec
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+
+def qid(uri):
+    match = _QID_RE.match(uri) if isinstance(uri, str) else None
+    return match.group(1) if match else None
+
+def batch_query(qids):
+    values = " ".join(f"wd:{q}" for q in qids)
+    variables = " ".join(f"?{p}" for p, _ in GETTY_PROPERTIES)
+    optionals = "\n".join(f"        OPTIONAL {{ ?item wdt:{p} ?{p} . }}" for p, _ in GETTY_PROPERTIES)
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    SELECT ?item {variables} WHERE {{
+        VALUES ?item {{ {values} }}
+{optionals}
+    }}
+    """
+
+def parse_bindings(bindings):
+    # QID -> URI Getty (None si l'élément n'a aucun identifiant Getty)
+    mapping = {}
+    for row in bindings:
+        item = qid(row.get("item", {}).get("value"))
+        if item is None or mapping.get(item):
+            continue
+        mapping[item] = None
+        for prop, namespace in GETTY_PROPERTIES:
+            value = row.get(prop, {}).get("value")
+            if value:
+                mapping[item] = namespace + value
+                break
+    return mapping
+
+class Crosswalk:
+    def __init__(self, endpoint, cache=None, batch_size=BATCH_SIZE, window=BATCH_WINDOW):
+        self.endpoint = endpoint
+        self.cache = cache
+        self.batch_size = batch_size
+        self.window = window
+        self._condition = threading.Condition()
+        self._mapping = {}
+        self._queued = set()
+        self._inflight = set()
+        self._leader = False
+        # Après un lot en échec, plus de requête avant _retry_at (délai doublé à chaque échec)
+        self._backoff = BACKOFF_INITIAL
+        self._retry_at = 0.0
+
+    def _known(self, q):
+        # Appelé sous self._condition ; correspondance déjà obtenue, ici ou dans le cache de vocabulaire
+        if q in self._mapping:
+            return True
+        if self.cache is not None:
+            uri = self.cache.peek(CACHE_PREFIX + q)
+            if uri is not MISSING:
+                self._mapping[q] = uri
+                return True
+        return False
+
+    def _fetch(self, qids, timeout):
+        import requests
+
+        user_agent = "WDQS-example Python/%s.%s" % (sys.version_info[0], sys.version_info[1])
+        mapping = {}
+        for start in range(0, len(qids), self.batch_size):
+            batch = qids[start:start + self.batch_size]
+            with metrics.lookup("endpoint", "crosswalk"):
+                response = requests.post(
+                    self.endpoint,
+                    data={"query": batch_query(batch), "format": "json"},
+                    headers={"Accept": "application/sparql-results+json", "User-Agent": user_agent},
+                    timeout=timeout,
+                )
+                response.raise_for_status()
+            found = parse_bindings(response.json().get("results", {}).get("bindings", []))
+            mapping.update({q: found.get(q) for q in batch})
+        return mapping
+
+    def _send(self, timeout):
+        # Meneur : envoie les QID regroupés pendant la fenêtre d'attente
+        time.sleep(self.window)
+        with self._condition:
+            batch = sorted(self._queued)
+            self._queued.clear()
+            self._inflight.update(batch)
+            self._leader = False
+        try:
+            mapping = self._fetch(batch, timeout)
+        except Exception as e:
+            logger.warning("Correspondance Wikidata -> Getty impossible: %s", e)
+            note_error(f"crosswalk: {e}")
+            mapping = {}
+            with self._condition:
+                self._retry_at = time.monotonic() + self._backoff
+                self._backoff = min(self._backoff * 2, BACKOFF_MAX)
+        else:
+            with self._condition:
+                self._backoff = BACKOFF_INITIAL
+        if self.cache is not None:
+            for q, uri in mapping.items():
+                self.cache.put(CACHE_PREFIX + q, uri)
+        with self._condition:
+            self._mapping.update(mapping)
+            self._inflight.difference_update(batch)
+            self._condition.notify_all()
+
+    def _enqueue(self, qids):
+        # Appelé sous self._condition : renvoie True si l'appelant devient meneur du prochain lot
+        if time.monotonic() < self._retry_at:
+            return False
+        self._queued.update(q for q in qids if q not in self._inflight and not self._known(q))
+        leader = bool(self._queued) and not self._leader
+        if leader:
+            self._leader = True
+        return leader
+
+    def prefetch(self, qids, timeout=10.0):
+        # Met les QID en file sans attendre : le lot part dans un thread dès la fin de la fenêtre
+        with self._condition:
+            leader = self._enqueue(qids)
+        if leader:
+            threading.Thread(target=self._send, args=(timeout,), name="crosswalk", daemon=True).start()
+
+    def translate(self, qids, timeout=10.0):
+        # QID -> URI Getty pour ceux qui en ont une ; en cas d'erreur, les QID restent non traduits
+        # (et seront redemandés une fois le délai d'attente écoulé)
+        while True:
+            with self._condition:
+                if time.monotonic() < self._retry_at:
+                    break
+                missing = [q for q in qids if not self._known(q)]
+                leader = self._enqueue(missing)
+
+            if leader:
+                self._send(timeout)
+
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: all(q in self._mapping or (q not in self._queued and q not in self._inflight) for q in missing)
+                    or (self._queued and not self._leader),
+                    timeout=timeout,
+                )
+                # QID ajoutés à un lot dont le meneur est déjà parti : ce worker envoie le suivant
+                if not any(q not in self._mapping and q in self._queued for q in missing):
+                    break
+        with self._condition:
+            return {q: self._mapping[q] for q in qids if self._mapping.get(q)}
+
+def _collect(value, found):
+    if isinstance(value, dict):
+        for item in value.values():
+            _collect(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _collect(item, found)
+    else:
+        q = qid(value)
+        if q is not None:
+            found.add(q)
+
+def _replace(value, mapping):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _replace(item, mapping)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            value[index] = _replace(item, mapping)
+    else:
+        q = qid(value)
+        if q is not None and q in mapping:
+            return mapping[q]
+    return value
+
+def apply_crosswalk(document, crosswalk, timeout=10.0):
+    # Remplace sur place les URI Wikidata du document Linked Art par leur équivalent Getty
+    found = set()
+    _collect(document, found)
+    if found:
+        mapping = crosswalk.translate(sorted(found), timeout)
+        if mapping:
+            _replace(document, mapping)
+    return document
@@ -0,0 +1,154 @@
+import re
+from functools import lru_cache
+
+from intermediate import NOT_SPECIFIED, UNKNOWN_DATE
+
+# Marge appliquée aux dates approximatives ("vers 1600")
+CIRCA_MARGIN = 10
+
+# Dynasties et règnes chinois (années de début et de fin)
+PERIODS = {
+    "shang": (-1600, -1046), "zhou de l'ouest": (-1046, -771), "zhou de l'est": (-770, -256), "zhou": (-1046, -256),
+    "qin": (-221, -206), "han": (-206, 220), "trois royaumes": (220, 280), "jin": (265, 420),
+    "dynasties du nord et du sud": (420, 589), "sui": (581, 618), "tang": (618, 907),
+    "cinq dynasties": (907, 960), "song du nord": (960, 1127), "song du sud": (1127, 1279), "song": (960, 1279),
+    "liao": (907, 1125), "yuan": (1279, 1368), "ming": (1368, 1644), "qing": (1644, 1911),
+    "hongwu": (1368, 1398), "yongle": (1403, 1424), "xuande": (1426, 1435), "chenghua": (1465, 1487),
+    "hongzhi": (1488, 1505), "zhengde": (1506, 1521), "jiajing": (1522, 1566), "longqing": (1567, 1572),
+    "wanli": (1573, 1620), "tianqi": (1621, 1627), "chongzhen": (1628, 1644), "shunzhi": (1644, 1661),
+    "kangxi": (1661, 1722), "yongzheng": (1723, 1735), "qianlong": (1736, 1795), "jiaqing": (1796, 1820),
+    "daoguang": (1821, 1850), "xianfeng": (1851, 1861), "tongzhi": (1862, 1874), "guangxu": (1875, 1908),
+    "xuantong": (1909, 1911),
+}
+
+# Subdivisions d'un siècle : (début, fin) en années depuis le début du siècle
+CENTURY_PARTS = {
+    "1ère moitié": (0, 49), "1re moitié": (0, 49), "première moitié": (0, 49),
+    "2e moitié": (50, 99), "2ème moitié": (50, 99), "seconde moitié": (50, 99), "deuxième moitié": (50, 99),
+    "1er quart": (0, 24), "premier quart": (0, 24), "2e quart": (25, 49), "2ème quart": (25, 49),
+    "3e quart": (50, 74), "3ème quart": (50, 74), "4e quart": (75, 99), "4ème quart": (75, 99), "dernier quart": (75, 99),
+    "début": (0, 32), "milieu": (40, 59), "fin": (67, 99),
+}
+
+ROMAN = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100}
+
+_BC = r"(?:\s*av(?:ant|\.)?\s*J\.?-?C\.?)"
+_AD = r"(?:\s*ap(?:rès|\.)?\s*J\.?-?C\.?)"
+_RANGE_RE = re.compile(rf"(?<!\d)(\d{{1,4}})({_BC})?{_AD}?\s*(?:-|–|/|à|et)\s*(\d{{1,4}})({_BC})?(?!\d)", re.IGNORECASE)
+_YEAR_RE = re.compile(rf"(?<!\d)(\d{{3,4}})({_BC})?(?!\d)", re.IGNORECASE)
+_CIRCA_RE = re.compile(r"\b(?:vers|circa|ca\.?|env\.?|environ)\s", re.IGNORECASE)
+_CENTURY_RE = re.compile(r"\b(\d{1,2}|[IVXLC]+)(?:e|ème|è|er|re)\s*(?:[-–/]\s*(\d{1,2}|[IVXLC]+)(?:e|ème|è|er|re)\s*)?siècles?(" + _BC + r")?", re.IGNORECASE)
+_CENTURY_PART_RE = re.compile(r"\b(" + "|".join(sorted(map(re.escape, CENTURY_PARTS), key=len, reverse=True)) + r")\s+(?:du\s+|de\s+la\s+|d'|de\s+)?", re.IGNORECASE)
+_PERIOD_RE = re.compile(r"\b(" + "|".join(sorted(map(re.escape, PERIODS), key=len, reverse=True)) + r")\b", re.IGNORECASE)
+_ISO_RE = re.compile(r"^(-?\d{1,4})(?:-(\d{2})-(\d{2}))?(?:T[\d:.]+Z?)?$")
+
+# Libellés analysés mémorisés : borné, les libellés libres pouvant être tous distincts
+PARSE_CACHE_SIZE = 4096
+
+def _number(token):
+    if token.isdigit():
+        return int(token)
+    total, previous = 0, 0
+    for char in reversed(token.upper()):
+        value = ROMAN[char]
+        total = total - value if value < previous else total + value
+        previous = max(previous, value)
+    return total
+
+def _century_bounds(century, bc=False):
+    if bc:
+        return -century * 100, -(century - 1) * 100 - 1
+    return (century - 1) * 100, (century - 1) * 100 + 99
+
+def _parse_period(text):
+    # Intervalle explicite : "1600 / 1700", "Ming (1368-1644)", "206 av. J.-C. - 220 ap. J.-C."
+    match = _RANGE_RE.search(text)
+    if match:
+        begin, end = int(match.group(1)), int(match.group(3))
+        if match.group(4):
+            end = -end
+            begin = -begin
+        elif match.group(2):
+            begin = -begin
+        if begin <= end:
+            return begin, end
+
+    # Siècle(s) : "XVIIIe siècle", "17e-18e siècle", "1ère moitié du 18e siècle"
+    match = _CENTURY_RE.search(text)
+    if match:
+        bc = bool(match.group(3))
+        begin, end = _century_bounds(_number(match.group(1)), bc)
+        if match.group(2):
+            end = _century_bounds(_number(match.group(2)), bc)[1]
+        part = _CENTURY_PART_RE.search(text[:match.start()])
+        if part and not match.group(2):
+            offset_begin, offset_end = CENTURY_PARTS[part.group(1).lower()]
+            begin, end = begin + offset_begin, begin + offset_end
+        return begin, end
+
+    # Dynastie ou règne : "Dynastie Qing", "époque Kangxi"
+    match = _PERIOD_RE.search(text)
+    if match:
+        return PERIODS[match.group(1).lower()]
+
+    # Année seule, éventuellement approximative : "1600", "vers 1600"
+    match = _YEAR_RE.search(text)
+    if match:
+        year = -int(match.group(1)) if match.group(2) else int(match.group(1))
+        if _CIRCA_RE.search(text):
+            return year - CIRCA_MARGIN, year + CIRCA_MARGIN
+        return year, year
+
+    return None
+
+_cached_parse_period = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_period)
+
+def parse_period(text):
+    if not text or text == NOT_SPECIFIED:
+        return None
+    return _cached_parse_period(text)
+
+def _year(value):
+    if isinstance(value, dict):
+        value = value.get("@value")
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        match = _ISO_RE.match(value.strip())
+        if match:
+            return int(match.group(1))
+    return None
+
+def to_begin_datetime(year):
+    return f"{'-' if year < 0 else ''}{abs(year):04d}-01-01T00:00:00"
+
+def to_end_datetime(year):
+    return f"{'-' if year < 0 else ''}{abs(year):04d}-12-31T23:59:59"
+
+def normalize_timespan(label, beginning, end):
+    # Années structurées de la source en priorité, sinon analyse du libellé
+    begin_year, end_year = _year(beginning), _year(end)
+    if begin_year is None and end_year is None:
+        bounds = parse_period(label)
+        if bounds is None:
+            return None, None
+        begin_year, end_year = bounds
+    elif begin_year is None:
+        begin_year = end_year
+    elif end_year is None:
+        end_year = begin_year
+    return to_begin_datetime(begin_year), to_end_datetime(end_year)
+
+def normalize_timespans(record):
+    # Normalisation des dates (création, acquisition) d'une représentation intermédiaire
+    timespan = record.timespan
+    timespan.beginning, timespan.end = normalize_timespan(timespan.creation_date, timespan.beginning, timespan.end)
+
+    acquisition = record.changed_ownership_through
+    if acquisition:
+        acquisition.timespan_beginning, acquisition.timespan_end = normalize_timespan(
+            None,
+            None if acquisition.timespan_beginning == UNKNOWN_DATE else acquisition.timespan_beginning,
+            None if acquisition.timespan_end == UNKNOWN_DATE else acquisition.timespan_end,
+        )
+    return record
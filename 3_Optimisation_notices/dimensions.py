@@ -0,0 +1,99 @@
+import math, re, threading
+from functools import lru_cache
+
+from intermediate import NOT_SPECIFIED, NOT_SPECIFIED_URI
+
+# Unité canonique de sortie : toutes les longueurs sont converties en centimètres
+CANONICAL_UNIT = "centimeters"
+
+# Libellés d'unités rencontrés dans les sources -> unité normalisée
+UNIT_ALIASES = {
+    "mm": "mm", "millimètre": "mm", "millimètres": "mm", "millimeter": "mm", "millimeters": "mm",
+    "cm": "cm", "centimètre": "cm", "centimètres": "cm", "centimeter": "cm", "centimeters": "cm", "centimetres": "cm",
+    "m": "m", "mètre": "m", "mètres": "m", "meter": "m", "meters": "m",
+    "in": "in", "inch": "in", "inches": "in", "pouce": "in", "pouces": "in",
+    "g": "g", "gramme": "g", "grammes": "g", "grams": "g",
+    "kg": "kg", "kilogramme": "kg", "kilogrammes": "kg", "kilograms": "kg",
+}
+
+# Facteurs de conversion vers l'unité canonique
+TO_CENTIMETERS = {"mm": 0.1, "cm": 1.0, "m": 100.0, "in": 2.54}
+
+# Unités résolues sans requête distante (AAT)
+UNIT_URIS = {
+    CANONICAL_UNIT: "http://vocab.getty.edu/aat/300379098",
+    "g": "http://vocab.getty.edu/aat/300379225",
+    "kg": "http://vocab.getty.edu/aat/300379226",
+    NOT_SPECIFIED: NOT_SPECIFIED_URI,
+}
+
+# Ex. "H. : 12,5 cm", "Diamètre : 8 mm", "12.5" ; seules les unités connues sont reconnues ("12 x 8 cm" -> 12 cm)
+_UNIT_PATTERN = "|".join(sorted(map(re.escape, UNIT_ALIASES), key=len, reverse=True))
+_DIMENSION_RE = re.compile(rf"(?P<value>\d+(?:[.,]\d+)?)\s*(?:(?P<unit>{_UNIT_PATTERN})(?![^\W\d_])\.?)?", re.IGNORECASE)
+_UNIT_CLEAN_RE = re.compile(r"[\s.]+")
+
+# Couples (valeur brute, unité) mémorisés : borné, les libellés libres pouvant être tous distincts
+PARSE_CACHE_SIZE = 4096
+
+_unit_uris = dict(UNIT_URIS)
+_unit_lock = threading.Lock()
+
+def _literal(value):
+    # Littéral typé JSON-LD (Agorha) : {"@value": ..., "@type": ...}
+    if isinstance(value, dict):
+        return value.get("@value")
+    return value
+
+def _normalize_unit(label):
+    if not label or label == NOT_SPECIFIED:
+        return None
+    # Unité inconnue : traitée comme absente (centimètres par défaut)
+    return UNIT_ALIASES.get(_UNIT_CLEAN_RE.sub("", str(label).strip().lower()))
+
+def parse_dimension(raw, unit=None):
+    raw, unit = _literal(raw), _literal(unit)
+    # Valeurs non hachables (listes...) : analysées sans passer par la table
+    if not isinstance(raw, (str, int, float, type(None))) or not isinstance(unit, (str, type(None))):
+        return _parse_dimension(raw, unit)
+    return _cached_parse_dimension(raw, unit)
+
+def _parse_dimension(raw, unit):
+    unit = _normalize_unit(unit)
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        value = float(raw)
+    else:
+        match = _DIMENSION_RE.search(str(raw)) if raw and raw != NOT_SPECIFIED else None
+        if not match:
+            return math.nan, NOT_SPECIFIED
+        value = float(match.group("value").replace(",", "."))
+        if match.group("unit"):
+            unit = _normalize_unit(match.group("unit"))
+
+    # Sans unité explicite, les sources donnent des centimètres
+    if unit is None:
+        unit = "cm"
+    factor = TO_CENTIMETERS.get(unit)
+    if factor is None:
+        return value, unit
+    return round(value * factor, 6), CANONICAL_UNIT
+
+_cached_parse_dimension = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_dimension)
+
+def normalize_dimensions(record):
+    # Normalisation des dimensions d'une représentation intermédiaire (valeurs en centimètres)
+    for name in ("width", "height", "length"):
+        unit_name = f"{name}_unit"
+        value, unit = parse_dimension(getattr(record, name), getattr(record, unit_name))
+        setattr(record, name, None if math.isnan(value) else value)
+        setattr(record, unit_name, unit)
+    return record
+
+def unit_uri(unit, resolver):
+    # Chaque unité distincte n'est résolue qu'une fois par exécution
+    uri = _unit_uris.get(unit)
+    if uri is None:
+        # Requête distante hors du verrou : une résolution lente ne bloque pas les autres unités
+        uri = resolver(unit)
+        with _unit_lock:
+            uri = _unit_uris.setdefault(unit, uri)
+    return uri
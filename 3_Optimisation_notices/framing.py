@@ -0,0 +1,145 @@
+import json, threading
+from itertools import islice
+
+# Mise en forme des notices Agorha (.jsonld) avant extraction, sans accès réseau :
+#   - clés ramenées aux IRI compactes attendues par les règles (crm:P…, rdfs:label), quel que soit
+#     le contexte de la notice (IRI complètes, autre préfixe, termes définis dans @context) ;
+#   - @graph aplati : les références {"@id": …} vers d'autres nœuds du graphe sont remplacées
+#     par le nœud lui-même, et la notice devient le nœud principal ;
+#   - {"@set": […]} / {"@list": […]} remplacés par la liste.
+# Les contextes distants ne sont jamais téléchargés : seul le contexte local ci-dessous est utilisé.
+
+# Contexte local : préfixe -> espace de noms
+LOCAL_CONTEXT = {
+    "crm": "http://www.cidoc-crm.org/cidoc-crm/",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "dc": "http://purl.org/dc/elements/1.1/",
+}
+
+# Autres espaces de noms du CIDOC-CRM rencontrés dans les exports, ramenés au préfixe crm
+NAMESPACE_ALIASES = {
+    "https://www.cidoc-crm.org/cidoc-crm/": "crm",
+    "http://erlangen-crm.org/current/": "crm",
+    "http://www.cidoc-crm.org/cidoc-crm#": "crm",
+}
+
+# Propriété permettant de reconnaître le nœud principal d'un @graph
+MAIN_NODE_KEY = "crm:P102_has_title"
+
+_NAMESPACES = sorted(
+    [(namespace, prefix) for prefix, namespace in LOCAL_CONTEXT.items()] + list(NAMESPACE_ALIASES.items()),
+    key=lambda item: -len(item[0]),
+)
+
+def compact_iri(iri):
+    for namespace, prefix in _NAMESPACES:
+        if iri.startswith(namespace):
+            return f"{prefix}:{iri[len(namespace):]}"
+    return iri
+
+class _KeyMap:
+    # Clé telle qu'écrite dans une notice -> clé compacte, pour un @context donné (mémoïsé)
+    def __init__(self, context):
+        self.prefixes = {}
+        self.terms = {}
+        for definitions in context if isinstance(context, list) else [context]:
+            # Contexte distant (URL) : ignoré, pas de téléchargement
+            if not isinstance(definitions, dict):
+                continue
+            for term, definition in definitions.items():
+                if isinstance(definition, dict):
+                    definition = definition.get("@id")
+                if not isinstance(definition, str) or term.startswith("@"):
+                    continue
+                if definition.endswith(("/", "#")):
+                    self.prefixes[term] = definition
+                else:
+                    self.terms[term] = definition
+        self.keys = {}
+
+    def expand(self, key):
+        key = self.terms.get(key, key)
+        prefix, colon, suffix = key.partition(":")
+        if colon and not suffix.startswith("//"):
+            namespace = self.prefixes.get(prefix)
+            if namespace is not None:
+                return namespace + suffix
+        return key
+
+    def __call__(self, key):
+        compact = self.keys.get(key)
+        if compact is None:
+            compact = key if key.startswith("@") else compact_iri(self.expand(key))
+            self.keys[key] = compact
+        return compact
+
+_key_maps = {}
+_key_maps_lock = threading.Lock()
+
+def key_map(context):
+    # Un jeu de notices partage le plus souvent le même @context : une table par contexte distinct
+    cache_key = json.dumps(context, sort_keys=True) if context is not None else ""
+    mapping = _key_maps.get(cache_key)
+    if mapping is None:
+        with _key_maps_lock:
+            mapping = _key_maps.setdefault(cache_key, _KeyMap(context or {}))
+    return mapping
+
+_CONTAINERS = (dict, list)
+
+def _frame(value, mapping, nodes, ancestors):
+    # Copie à l'écriture : une notice déjà compacte est renvoyée telle quelle, sans allocation
+    if value.__class__ is list:
+        framed = None
+        for index, item in enumerate(value):
+            new = _frame(item, mapping, nodes, ancestors) if item.__class__ in _CONTAINERS else item
+            if framed is None:
+                if new is item:
+                    continue
+                framed = value[:index]
+            framed.append(new)
+        return value if framed is None else framed
+
+    if len(value) == 1:
+        if "@set" in value or "@list" in value:
+            (items,) = value.values()
+            return _frame(items if items.__class__ is list else [items], mapping, nodes, ancestors)
+        # Référence vers un autre nœud du graphe : incorporée (sauf cycle)
+        identifier = value.get("@id")
+        if identifier in nodes and identifier not in ancestors:
+            return _frame(nodes[identifier], mapping, nodes, ancestors | {identifier})
+
+    keys = mapping.keys
+    framed = None
+    for index, (key, item) in enumerate(value.items()):
+        compact = keys.get(key) or mapping(key)
+        new = _frame(item, mapping, nodes, ancestors) if item.__class__ in _CONTAINERS else item
+        if framed is None:
+            if new is item and (compact is key or compact == key):
+                continue
+            framed = dict(islice(value.items(), index))
+        framed[compact] = new
+    return value if framed is None else framed
+
+def frame_notice(document):
+    # Notice Agorha -> nœud principal, clés compactes (crm:, rdfs:), références incorporées
+    if document.__class__ is not dict:
+        return document
+    context = document.get("@context")
+    mapping = key_map(context)
+    graph = document.get("@graph")
+
+    if graph is None:
+        if context is not None:
+            document = {key: value for key, value in document.items() if key != "@context"}
+        return _frame(document, mapping, {}, frozenset())
+
+    graph = graph if isinstance(graph, list) else [graph]
+    nodes = {node["@id"]: node for node in graph if isinstance(node, dict) and "@id" in node}
+    main = next(
+        (node for node in graph if isinstance(node, dict) and any(mapping(key) == MAIN_NODE_KEY for key in node)),
+        graph[0] if graph else {},
+    )
+    return _frame(main, mapping, nodes, frozenset([main.get("@id")]))
@@ -0,0 +1,147 @@
+import threading, time
+from contextlib import contextmanager
+
+# Bornes des histogrammes de latence (secondes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+class Histogram:
+    __slots__ = ("counts", "total", "maximum")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def observe(self, seconds):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def quantile(self, q):
+        # Estimation par la borne supérieure du bucket atteint
+        count = self.count
+        if not count:
+            return 0.0
+        rank, seen = q * count, 0
+        for bound, n in zip(LATENCY_BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+class Instrumentation:
+    # Chronomètres par étape, histogrammes de latence des recherches et profilage optionnel
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.lookups = {}
+        self.cache = None
+        self.profiling = False
+        self._profilers = []
+        self._local = threading.local()
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.lookups.clear()
+            self._profilers.clear()
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._observe(self.stages, name, time.perf_counter() - start)
+
+    @contextmanager
+    def lookup(self, family, name):
+        # family : "endpoint" (getty, wikidata) ou "uri_searcher" (clé Linked Art)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._observe(self.lookups, (family, name), time.perf_counter() - start)
+
+    def _observe(self, table, name, seconds):
+        with self._lock:
+            histogram = table.get(name)
+            if histogram is None:
+                histogram = table[name] = Histogram()
+            histogram.observe(seconds)
+
+    def call(self, function, *args, **kwargs):
+        # En mode profilage, chaque thread a son propre cProfile (cProfile ne suit que le thread courant)
+        if not self.profiling:
+            return function(*args, **kwargs)
+        profiler = getattr(self._local, "profiler", None)
+        if profiler is None:
+            import cProfile
+
+            profiler = self._local.profiler = cProfile.Profile()
+            with self._lock:
+                self._profilers.append(profiler)
+        profiler.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    def dump_profile(self, path):
+        import pstats
+
+        with self._lock:
+            profilers = list(self._profilers)
+        if not profilers:
+            return None
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        stats.dump_stats(path)
+        return stats
+
+    def to_dict(self):
+        with self._lock:
+            stages = {name: {"count": h.count, "total": h.total, "max": h.maximum} for name, h in self.stages.items()}
+            lookups = {
+                f"{family}:{name}": {
+                    "count": h.count, "total": h.total, "max": h.maximum,
+                    "p50": h.quantile(0.5), "p99": h.quantile(0.99),
+                    "buckets": [("+Inf" if bound == float("inf") else bound, n) for bound, n in zip(LATENCY_BUCKETS, h.counts)],
+                }
+                for (family, name), h in self.lookups.items()
+            }
+        return {"stages": stages, "lookups": lookups}
+
+    def summary(self):
+        lines = [f"{'Étape':<44}{'appels':>9}{'total (s)':>12}{'moy. (ms)':>12}{'max (ms)':>12}"]
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: -item[1].total)
+            lookups = sorted(self.lookups.items(), key=lambda item: -item[1].total)
+        for name, h in stages:
+            lines.append(f"{name:<44}{h.count:>9}{h.total:>12.3f}{1000 * h.total / h.count:>12.2f}{1000 * h.maximum:>12.2f}")
+
+        lines.append("")
+        lines.append(f"{'Recherche':<44}{'appels':>9}{'total (s)':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+        for (family, name), h in lookups:
+            label = f"{family}:{name}"
+            lines.append(f"{label:<44}{h.count:>9}{h.total:>12.3f}{1000 * h.quantile(0.5):>12.2f}{1000 * h.quantile(0.99):>12.2f}")
+
+        if self.cache is not None:
+            stats = self.cache.stats()
+            lookups_count = stats["hits"] + stats["misses"]
+            ratio = stats["hits"] / lookups_count if lookups_count else 0.0
+            lines.append("")
+            lines.append(f"Cache vocabulaire : {stats['entries']} entrées, {stats['hits']} hits, {stats['misses']} miss ({ratio:.1%} de hits)")
+        return "\n".join(lines)
+
+# Instance partagée par tout le pipeline
+metrics = Instrumentation()
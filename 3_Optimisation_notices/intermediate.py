@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+
+# Valeurs sentinelles utilisées par les normaliseurs
+NOT_SPECIFIED = "Not Specified"
+UNKNOWN_DATE = "xxxx"
+
+NOT_SPECIFIED_URI = 'http://example.org/not_specified'
+NOT_FOUND_URI = 'http://example.org/not_found'
+NOT_EXPOSED_URI = 'http://example.org/not_exposed'
+
+# Représentation intermédiaire commune aux trois musées
+# (slots : pas de __dict__ par objet, accès aux champs plus rapide)
+
+@dataclass(slots=True)
+class TimeSpan:
+    creation_date: str | None = None
+    beginning: str | None = None
+    end: str | None = None
+
+@dataclass(slots=True)
+class Acquisition:
+    mode_of_transfer: str = NOT_SPECIFIED
+    timespan_beginning: str | None = UNKNOWN_DATE
+    timespan_end: str | None = UNKNOWN_DATE
+    previous_owner: str = NOT_SPECIFIED
+
+@dataclass(slots=True)
+class IntermediateRecord:
+    data_source: str
+    id: str
+    title: str
+    inventory_number: str | None = None
+    timespan: TimeSpan = field(default_factory=TimeSpan)
+    place_of_creation: str | None = NOT_SPECIFIED
+    creator: str = NOT_SPECIFIED
+    collection: str = NOT_SPECIFIED
+    width: str | float | None = None
+    height: str | float | None = None
+    length: str | float | None = None
+    width_unit: str = NOT_SPECIFIED
+    height_unit: str = NOT_SPECIFIED
+    length_unit: str = NOT_SPECIFIED
+    materials: list[str] = field(default_factory=list)
+    object_description: str | None = None
+    owner: str = NOT_SPECIFIED
+    current_permanent_custodian: str = NOT_SPECIFIED
+    current_custodian: str = NOT_SPECIFIED
+    current_location: str = NOT_SPECIFIED
+    changed_ownership_through: Acquisition | None = None
+    exhibition: str | None = None
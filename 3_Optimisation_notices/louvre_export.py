@@ -0,0 +1,44 @@
+import re
+
+from paris_dump import iter_entities
+from paths import Extractor, rule
+
+# Export complet des collections du Louvre (tableau JSON d'objets au format des notices
+# collections.louvre.fr/ark:/53355/<ark>.json) lu en flux : les objets liés à la Chine sont
+# retenus au passage, sans filtrage manuel du CSV ni téléchargement d'une notice par objet.
+
+# Motif cherché dans les champs de lieu et d'auteur ("Lieu de création : Chine", "Chine, atelier de Jingdezhen")
+CHINA_RE = re.compile(r"\b(?:chine|chinois(?:es?)?|china|chinese)\b", re.IGNORECASE)
+
+# Champs examinés, compilés une fois (voir paths.py)
+FILTER_FIELDS = Extractor({
+    "place_of_creation": rule("placeOfCreation", many=True),
+    "place_of_discovery": rule("placeOfDiscovery", many=True),
+    "creator": rule("creator.label", many=True),
+})
+
+_ARK_RE = re.compile(r"ark:/53355/([^/?#.]+)")
+
+def is_china_related(record, pattern=CHINA_RE):
+    if record.__class__ is not dict:
+        return False
+    search = pattern.search
+    for values in FILTER_FIELDS.extract(record).values():
+        for value in values:
+            if value.__class__ is str and search(value):
+                return True
+    return False
+
+def louvre_ark(record):
+    # Identifiant ARK de l'objet (nom du fichier de sortie, comme recuperation_louvre.py)
+    ark = record.get("arkId")
+    if ark:
+        return ark
+    match = _ARK_RE.search(record.get("url") or "")
+    return match.group(1) if match else None
+
+def iter_china_objects(path, key=None, pattern=CHINA_RE):
+    # Objets de l'export retenus par le filtre, un par un ; key : tableau des objets s'il n'est pas à la racine
+    for record in iter_entities(path, key):
+        if is_china_related(record, pattern):
+            yield record
@@ -0,0 +1,60 @@
+import re, threading
+
+# Découpage du champ libre materialsAndTechniques du Louvre en matériaux et techniques :
+#   "Matériau : porcelaine, bronze doré\nTechnique : peint" -> (["porcelaine", "bronze doré"], ["peint"])
+# Chaque texte distinct n'est découpé qu'une fois par exécution ; chaque matériau distinct est
+# ensuite résolu une fois par uri_searcher (cas particuliers, puis cache de vocabulaire).
+
+# Intitulés de rubrique -> catégorie
+FIELD_KINDS = {
+    "matériau": "materials", "matériaux": "materials", "matière": "materials", "matières": "materials",
+    "technique": "techniques", "techniques": "techniques",
+}
+
+# "Matériau : …" en début de ligne
+_FIELD_RE = re.compile(r"^\s*([^\W\d_]+)\s*:\s*(.*?)\s*$", re.MULTILINE)
+# Éléments séparés par , ; / hors parenthèses ("bronze (doré, ciselé)" reste un seul élément)
+_TOKEN_RE = re.compile(r"(?:\([^)]*\)|[^,;/()])+")
+# "porcelaine et bronze" -> deux éléments
+_AND_RE = re.compile(r"\s+et\s+(?![^(]*\))")
+
+_split_table = {}
+_split_lock = threading.Lock()
+
+def split_values(text):
+    tokens = []
+    for chunk in _TOKEN_RE.findall(text):
+        for token in _AND_RE.split(chunk):
+            token = token.strip(" .\t")
+            if token and token not in tokens:
+                tokens.append(token)
+    return tokens
+
+def _split(text):
+    found = {"materials": [], "techniques": []}
+    fields = _FIELD_RE.findall(text)
+    known = [(FIELD_KINDS.get(name.lower()), values) for name, values in fields if name.lower() in FIELD_KINDS]
+    # Texte sans rubrique reconnue : tout est pris comme matériaux
+    if not known:
+        known = [("materials", line) for line in text.splitlines()]
+    for kind, values in known:
+        for token in split_values(values):
+            if token not in found[kind]:
+                found[kind].append(token)
+    return tuple(found["materials"]), tuple(found["techniques"])
+
+def split_materials(text):
+    # (matériaux, techniques) ; tuples vides si le texte est vide
+    if not text:
+        return (), ()
+    result = _split_table.get(text)
+    if result is None:
+        result = _split(text)
+        with _split_lock:
+            _split_table[text] = result
+    return result
+
+def louvre_materials(text):
+    # Liste made_of de la représentation intermédiaire ; texte d'origine gardé s'il n'en sort aucun matériau
+    materials, _ = split_materials(text)
+    return list(materials) if materials else [text]
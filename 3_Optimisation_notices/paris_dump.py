@@ -0,0 +1,99 @@
+import json
+
+# Lecture en flux d'une réponse GraphQL Paris Musées ({"data": {"nodeQuery": {"count": ..., "entities": [...]}}}) :
+# les entités sont décodées une à une depuis le fichier, sans charger le document entier en mémoire.
+# Sert aussi aux exports dont la racine est directement le tableau (key=None), comme l'export Louvre.
+
+CHUNK_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+class _Stream:
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        # Ajoute un bloc au tampon en oubliant la partie déjà consommée ; False en fin de fichier
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def skip(self, characters):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in characters:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def peek(self):
+        if self.pos >= len(self.buffer) and not self.fill():
+            return ""
+        return self.buffer[self.pos]
+
+    def seek_array(self, key):
+        # Avance jusqu'au tableau associé à `key` (première occurrence de la clé dans le document),
+        # ou jusqu'au tableau racine si key est None
+        if key is None:
+            self.skip(_WHITESPACE + "\ufeff")
+            if self.peek() == "[":
+                self.pos += 1
+                return True
+            return False
+        marker = f'"{key}"'
+        while True:
+            index = self.buffer.find(marker, self.pos)
+            if index >= 0:
+                self.pos = index + len(marker)
+                self.skip(_WHITESPACE)
+                if self.peek() == ":":
+                    self.pos += 1
+                    self.skip(_WHITESPACE)
+                    if self.peek() == "[":
+                        self.pos += 1
+                        return True
+                continue
+            # Garder la fin du tampon au cas où la clé serait coupée entre deux blocs
+            self.pos = max(self.pos, len(self.buffer) - len(marker))
+            if not self.fill():
+                return False
+
+    def decode(self):
+        # Décode la valeur suivante, en lisant d'autres blocs tant qu'elle est incomplète
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+def iter_entities(path, key="entities", chunk_size=CHUNK_SIZE):
+    # Entités du tableau `key` (nodeQuery.entities) une par une ; les entrées nulles sont ignorées.
+    # key=None : le document est lui-même un tableau
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _Stream(f, chunk_size)
+        if not stream.seek_array(key):
+            return
+        while True:
+            stream.skip(_WHITESPACE + ",")
+            character = stream.peek()
+            if character == "]":
+                return
+            if character == "":
+                raise ValueError(f"fin de fichier inattendue dans {path}")
+            entity = stream.decode()
+            if entity is not None:
+                yield entity
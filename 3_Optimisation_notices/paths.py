@@ -0,0 +1,113 @@
+import re
+
+# Extraction déclarative dans les notices JSON(-LD) : chaque champ est décrit par un ou plusieurs
+# chemins ("crm:P108i_was_produced_by.crm:P14_carried_out_by.rdfs:label"), compilés une fois.
+# Un objet et une liste d'objets sont traités de la même façon : une clé appliquée à une liste
+# est cherchée dans chacun de ses éléments, et un objet seul se comporte comme une liste d'un élément.
+#
+#   clé       valeur de la clé (dans chaque élément si liste)
+#   clé[n]    n-ième élément (n négatif : depuis la fin) ; un objet seul est l'élément [0]
+#   clé[*]    tous les éléments
+
+_SEGMENT_RE = re.compile(r"^([^\[\]]*)((?:\[(?:-?\d+|\*)\])*)$")
+_INDEX_RE = re.compile(r"\[(-?\d+|\*)\]")
+
+_KEY, _INDEX, _ALL = 0, 1, 2
+
+def compile_path(path):
+    steps = []
+    for part in path.split("."):
+        match = _SEGMENT_RE.match(part)
+        if match is None or not (match.group(1) or match.group(2)):
+            raise ValueError(f"chemin invalide: {path!r}")
+        if match.group(1):
+            steps.append((_KEY, match.group(1)))
+        for index in _INDEX_RE.findall(match.group(2)):
+            steps.append((_ALL, None) if index == "*" else (_INDEX, int(index)))
+    return tuple(steps)
+
+def _present(value):
+    return value is not None and value != ""
+
+class Rule:
+    __slots__ = ("paths", "default", "many", "accept", "each", "required")
+
+    def __init__(self, paths, default=None, many=False, accept=None, each=None, required=False):
+        self.paths = tuple(compile_path(path) for path in paths)
+        self.default = default
+        self.many = many
+        self.accept = accept or _present
+        # Règle (ou Extractor) appliquée à chaque valeur trouvée
+        if isinstance(each, Rule):
+            each = Extractor({"value": each}), True
+        elif each is not None:
+            each = each, False
+        self.each = each
+        self.required = required
+
+def rule(*paths, default=None, many=False, accept=None, each=None, required=False):
+    # Les chemins sont des alternatives, essayées dans l'ordre
+    return Rule(paths, default, many, accept, each, required)
+
+def _items(value):
+    return value if value.__class__ is list else (value,)
+
+def _walker(steps, accept):
+    # Une fermeture par étape, chaînées une fois à la compilation : chacune parcourt la valeur
+    # (un objet seul étant vu comme une liste d'un élément) et transmet le résultat à la suivante
+    def collect(value, found):
+        for item in _items(value):
+            if accept(item):
+                found.append(item)
+    walk = collect
+    for kind, argument in reversed(steps):
+        walk = _step(kind, argument, walk)
+    return walk
+
+def _step(kind, argument, following):
+    if kind == _KEY:
+        def walk(value, found):
+            for item in _items(value):
+                if item.__class__ is dict and argument in item:
+                    following(item[argument], found)
+    elif kind == _INDEX:
+        stop = argument + 1 or None
+        def walk(value, found):
+            for item in _items(value)[argument:stop]:
+                following(item, found)
+    else:
+        def walk(value, found):
+            for item in _items(value):
+                following(item, found)
+    return walk
+
+class Extractor:
+    def __init__(self, rules):
+        self.rules = {name: r if isinstance(r, Rule) else rule(r) for name, r in rules.items()}
+        # Plan de lecture, une entrée par règle : alternatives déjà chaînées en fermetures
+        self._plan = tuple(
+            (name, tuple(_walker(steps, r.accept) for steps in r.paths), r.default, r.many, r.required)
+            + (r.each or (None, False))
+            for name, r in self.rules.items()
+        )
+
+    def extract(self, data):
+        result = {}
+        for name, walkers, default, many, required, each, single in self._plan:
+            # Alternatives essayées dans l'ordre, jusqu'à la première qui trouve une valeur
+            values = []
+            for walk in walkers:
+                walk(data, values)
+                if values:
+                    break
+            if not values:
+                if required:
+                    raise KeyError(f"champ obligatoire absent: {name}")
+                result[name] = [] if many and default is None else default
+                continue
+            if each is not None:
+                values = [each.extract(value) for value in values]
+                if single:
+                    values = [value["value"] for value in values]
+            result[name] = values if many else values[0]
+        return result
@@ -0,0 +1,108 @@
+import argparse, csv, logging, os, time
+from concurrent.futures import ThreadPoolExecutor
+
+import transformation_optimisee as pipeline
+
+logger = logging.getLogger(__name__)
+
+# Préchargement du cache de vocabulaire à partir des CSV de sélection (1_Recuperation_notices) :
+# les libellés (auteurs, collections, localisations) y figurent déjà, leurs URI peuvent donc être
+# cherchées pendant le téléchargement des notices plutôt qu'au moment de la transformation.
+#
+#   python recuperation_louvre.py &
+#   python prefetch.py --louvre ../1_Recuperation_notices/Louvre/results_filter_china_louvre.csv \
+#                      --agorha ../1_Recuperation_notices/Agorha/results_filter_china_agorha.csv
+#   python transformation_optimisee.py --vocab-cache vocabulary_cache.json
+#
+# Les libellés passent par uri_searcher, comme lors de la transformation : cas particuliers
+# et normalisation identiques, donc mêmes clés dans le cache.
+
+DEFAULT_CACHE_FILE = "vocabulary_cache.json"
+
+# Colonne du CSV Louvre -> clé uri_searcher
+# "Références géographiques / Lieux" (lieu de création) n'est pas reprise : la transformation ne cherche
+# pas d'URI pour le lieu de création (took_place_at pointe toujours vers la Chine, TGN 1000111), ses
+# libellés ne seraient donc jamais relus dans le cache.
+LOUVRE_COLUMNS = {
+    "Auteur": "carried_out_by",
+    "Collection": "member_of",
+    "Localisation": "current_location",
+}
+
+# Export Agorha : chaque cellule regroupe des sous-champs séparés par "§" (noms dans l'en-tête),
+# plusieurs valeurs d'un sous-champ étant séparées par "¤".
+# Préfixe de colonne -> (sous-champ, clé uri_searcher) ; le libellé est le dernier segment du chemin
+# du concept dans le thésaurus ("/personne/Xu, Zhimo" -> "Xu, Zhimo").
+AGORHA_FIELDS = {
+    "creationInformation.creation": ("person.conceptPath", "carried_out_by"),
+    "localizationInformation.localization": ("place.thesaurus.conceptPath", "current_location"),
+}
+
+def louvre_labels(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            for column, key in LOUVRE_COLUMNS.items():
+                value = (row.get(column) or "").strip()
+                # Plusieurs auteurs : seul le premier est repris dans la notice
+                if key == "carried_out_by":
+                    value = value.split(" ; ")[0].strip()
+                if value:
+                    yield value, key, "louvre"
+
+def agorha_labels(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=";")
+        header = next(reader, [])
+        columns = []
+        for index, name in enumerate(header):
+            subfields = name.split("§")
+            for prefix, (subfield, key) in AGORHA_FIELDS.items():
+                if subfields[0].startswith(prefix) and subfield in subfields:
+                    columns.append((index, subfields.index(subfield), key))
+        for row in reader:
+            for index, position, key in columns:
+                values = row[index].split("§") if index < len(row) else []
+                if position >= len(values):
+                    continue
+                for concept_path in values[position].split("¤"):
+                    label = concept_path.rstrip("/").rsplit("/", 1)[-1].strip()
+                    if label:
+                        yield label, key, "agorha"
+
+def prefetch(labels, workers=8):
+    # Recherche de chaque (libellé, clé, musée) distinct ; renvoie le nombre de recherches lancées
+    unique = list(dict.fromkeys(labels))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(lambda item: pipeline.uri_searcher(*item), unique):
+            pass
+    return len(unique)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Préchargement du cache de vocabulaire depuis les CSV de sélection")
+    parser.add_argument("--louvre", action="append", default=[], metavar="CSV", help="CSV de sélection Louvre (répétable)")
+    parser.add_argument("--agorha", action="append", default=[], metavar="CSV", help="export CSV Agorha (répétable)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_FILE, metavar="FICHIER", help="fichier du cache (complété s'il existe, défaut : %(default)s)")
+    parser.add_argument("--workers", type=int, default=8, help="recherches simultanées (défaut : %(default)s)")
+    parser.add_argument("--timeout", type=float, default=pipeline.LOOKUP_TIMEOUT, help="délai maximal par requête SPARQL, en secondes")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    pipeline.LOOKUP_TIMEOUT = args.timeout
+
+    cache = pipeline.vocabulary_cache
+    if os.path.exists(args.cache):
+        print(f"{cache.load(args.cache)} libellés déjà en cache ({args.cache})")
+
+    labels = []
+    for path in args.louvre:
+        labels.extend(louvre_labels(path))
+    for path in args.agorha:
+        labels.extend(agorha_labels(path))
+
+    start = time.perf_counter()
+    count = prefetch(labels, args.workers)
+    saved = cache.save(args.cache)
+    print(f"{count} libellés distincts cherchés en {time.perf_counter() - start:.1f} s, {saved} entrées enregistrées dans {args.cache}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import json, os, re, threading, time, traceback
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from intermediate import NOT_FOUND_URI, NOT_SPECIFIED_URI
+
+# Fichier en cours de traitement dans le thread courant
+_local = threading.local()
+
+UNRESOLVED_URIS = {NOT_FOUND_URI: "not_found", NOT_SPECIFIED_URI: "not_specified"}
+
+_INDEX_RE = re.compile(r"\[\d+\]")
+
+def note_uri(key, label, uri):
+    # Appelé par uri_searcher : garde la trace des libellés non résolus
+    entry = getattr(_local, "entry", None)
+    if entry is not None and uri in UNRESOLVED_URIS:
+        entry["unresolved"].append({"key": key, "label": label, "uri": uri})
+
+def note_error(message):
+    # Erreurs non bloquantes (SPARQL, réseau) rattachées au fichier en cours
+    entry = getattr(_local, "entry", None)
+    if entry is not None:
+        entry["warnings"].append(message)
+
+def note_violation(path, message):
+    # Écart au schéma Linked Art relevé par l'étape de validation
+    entry = getattr(_local, "entry", None)
+    if entry is not None:
+        entry["violations"].append({"path": path, "message": message})
+
+class RunReport:
+    # Rapport d'exécution lisible par machine : statut et durée par fichier, URIs non résolues, caches
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.duration = None
+        self.files = []
+
+    def add(self, entry):
+        with self._lock:
+            self.files.append(entry)
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._start
+        return self
+
+    def summary(self):
+        with self._lock:
+            files = list(self.files)
+        duration = self.duration if self.duration is not None else time.perf_counter() - self._start
+        statuses = Counter((f["source"], f["status"]) for f in files)
+        unresolved = Counter((u["key"], UNRESOLVED_URIS[u["uri"]]) for f in files for u in f["unresolved"])
+        # Écarts regroupés par chemin sans indices : "dimension[].value: type attendu number, trouvé null"
+        violations = Counter(f'{_INDEX_RE.sub("[]", v["path"])}: {v["message"]}' for f in files for v in f.get("violations", ()))
+        ok = sum(n for (_, status), n in statuses.items() if status == "ok")
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(duration, 3),
+            "files": len(files),
+            "files_ok": ok,
+            "files_error": len(files) - ok,
+            "objects_per_second": round(ok / duration, 2) if duration else 0.0,
+            "by_source": {f"{source}:{status}": n for (source, status), n in sorted(statuses.items())},
+            "unresolved_uris": {f"{key}:{kind}": n for (key, kind), n in sorted(unresolved.items())},
+            "files_with_violations": sum(1 for f in files if f.get("violations")),
+            "schema_violations": dict(violations.most_common()),
+        }
+
+    def to_dict(self, metrics=None):
+        report = {"summary": self.summary()}
+        if metrics is not None:
+            report["stages"] = metrics.to_dict()
+            if metrics.cache is not None:
+                report["cache"] = metrics.cache.stats()
+        with self._lock:
+            report["files"] = list(self.files)
+        return report
+
+    def write_json(self, path, metrics=None):
+        _write_atomic(path, json.dumps(self.to_dict(metrics), indent=2, ensure_ascii=False))
+        return path
+
+    def write_prometheus(self, path, metrics=None):
+        # Format texte Prometheus / OpenMetrics (collecteur "textfile" de node_exporter)
+        summary = self.summary()
+        lines = [
+            "# HELP linkedart_run_duration_seconds Durée de la dernière exécution.",
+            "# TYPE linkedart_run_duration_seconds gauge",
+            f"linkedart_run_duration_seconds {summary['duration_seconds']}",
+            "# HELP linkedart_run_objects_per_second Débit de la dernière exécution.",
+            "# TYPE linkedart_run_objects_per_second gauge",
+            f"linkedart_run_objects_per_second {summary['objects_per_second']}",
+            "# HELP linkedart_run_timestamp_seconds Début de la dernière exécution.",
+            "# TYPE linkedart_run_timestamp_seconds gauge",
+            f"linkedart_run_timestamp_seconds {self.started_at.timestamp():.0f}",
+            "# HELP linkedart_files Fichiers traités par source et statut.",
+            "# TYPE linkedart_files gauge",
+        ]
+        for name, n in summary["by_source"].items():
+            source, status = name.rsplit(":", 1)
+            lines.append(f'linkedart_files{{source="{source}",status="{status}"}} {n}')
+        lines += [
+            "# HELP linkedart_unresolved_uris URIs non résolues par clé Linked Art.",
+            "# TYPE linkedart_unresolved_uris gauge",
+        ]
+        for name, n in summary["unresolved_uris"].items():
+            key, kind = name.rsplit(":", 1)
+            lines.append(f'linkedart_unresolved_uris{{key="{key}",kind="{kind}"}} {n}')
+        lines += [
+            "# HELP linkedart_schema_violations Écarts au schéma Linked Art (étape de validation).",
+            "# TYPE linkedart_schema_violations gauge",
+            f"linkedart_schema_violations {sum(summary['schema_violations'].values())}",
+        ]
+
+        if metrics is not None:
+            stats = metrics.to_dict()
+            lines += [
+                "# HELP linkedart_stage_seconds Temps cumulé par étape du pipeline.",
+                "# TYPE linkedart_stage_seconds gauge",
+            ]
+            for stage, values in stats["stages"].items():
+                lines.append(f'linkedart_stage_seconds{{stage="{stage}"}} {values["total"]:.6f}')
+            lines += [
+                "# HELP linkedart_lookup_seconds Latence des recherches de vocabulaire.",
+                "# TYPE linkedart_lookup_seconds histogram",
+            ]
+            for name, values in stats["lookups"].items():
+                family, target = name.split(":", 1)
+                labels = f'family="{family}",name="{target}"'
+                cumulative = 0
+                for bound, n in values["buckets"]:
+                    cumulative += n
+                    lines.append(f'linkedart_lookup_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"linkedart_lookup_seconds_sum{{{labels}}} {values['total']:.6f}")
+                lines.append(f"linkedart_lookup_seconds_count{{{labels}}} {values['count']}")
+            if metrics.cache is not None:
+                cache = metrics.cache.stats()
+                lines += [
+                    "# HELP linkedart_vocabulary_cache Statistiques du cache de vocabulaire.",
+                    "# TYPE linkedart_vocabulary_cache gauge",
+                ]
+                for name in ("entries", "hits", "misses"):
+                    lines.append(f'linkedart_vocabulary_cache{{stat="{name}"}} {cache[name]}')
+        lines.append("# EOF")
+        _write_atomic(path, "\n".join(lines) + "\n")
+        return path
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def open_entry(name, source):
+    return {"file": name, "source": source, "status": "ok", "duration": None, "unresolved": [], "warnings": [], "violations": [], "_start": time.perf_counter()}
+
+def current_entry():
+    return getattr(_local, "entry", None)
+
+@contextmanager
+def bind_entry(entry):
+    # Rattache les notes (URIs non résolues, erreurs) du thread courant à `entry`
+    previous = getattr(_local, "entry", None)
+    _local.entry = entry
+    try:
+        yield entry
+    finally:
+        _local.entry = previous
+
+def close_entry(report, entry, error=None):
+    if error is not None:
+        entry["status"] = "error"
+        entry["error"] = f"{type(error).__name__}: {error}"
+        entry["traceback"] = "".join(traceback.format_exception(error))
+    entry["duration"] = round(time.perf_counter() - entry.pop("_start"), 6)
+    report.add(entry)
+
+@contextmanager
+def track_file(report, name, source):
+    # Mesure un fichier et enregistre son statut ; l'exception éventuelle est relancée
+    if report is None:
+        yield None
+        return
+    entry = open_entry(name, source)
+    try:
+        with bind_entry(entry):
+            yield entry
+    except Exception as e:
+        close_entry(report, entry, e)
+        raise
+    close_entry(report, entry)
@@ -0,0 +1,173 @@
+import json, logging, os, signal, socketserver, sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import transformation_optimisee as pipeline
+from instrumentation import metrics
+from report import bind_entry, open_entry
+
+logger = logging.getLogger(__name__)
+
+# Mode serveur : un processus longue durée garde en mémoire le cache de vocabulaire
+# et transforme les notices à la demande (quelques millisecondes une fois le cache chaud).
+#
+#   POST /transform[/<source>]              corps = notice JSON     -> Linked Art
+#   POST /transform[/<source>]?path=FICHIER notice lue sur le disque -> Linked Art
+#   (écarts à un sous-ensemble du schéma Linked Art, voir validation.py, dans X-Linkedart-Violations
+#    si --validate ; ce n'est pas une vérification de conformité complète)
+#   (sans <source>, le format de la notice est détecté)
+#   GET  /health                          état et statistiques du cache
+#   GET  /metrics                         temps par étape et latences des recherches
+
+class TransformHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+    def _send_json(self, status, body, headers=None, content_type="application/json"):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_notice(self, url):
+        path = (parse_qs(url.query).get("path") or [None])[0]
+        if path is None:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+
+        # Seuls les fichiers sous le dossier racine du serveur sont lisibles
+        full_path = os.path.realpath(os.path.join(self.server.root, path))
+        if os.path.commonpath([full_path, self.server.root]) != self.server.root:
+            raise PermissionError(f"chemin hors de {self.server.root}: {path}")
+        with open(full_path, "r", encoding="utf-8") as infile:
+            return json.load(infile)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            cache = metrics.cache.stats() if metrics.cache is not None else {}
+            self._send_json(200, {"status": "ok", "cache": cache})
+        elif path == "/metrics":
+            self._send_json(200, metrics.to_dict())
+        else:
+            self._send_json(404, {"error": f"chemin inconnu: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) not in (1, 2) or parts[0] != "transform":
+            self._send_json(404, {"error": f"chemin inconnu: {url.path}"})
+            return
+        source = parts[1] if len(parts) == 2 else None
+        if source is not None and source not in pipeline.NORMALIZERS:
+            self._send_json(404, {"error": f"source inconnue: {source}", "sources": sorted(pipeline.NORMALIZERS)})
+            return
+
+        try:
+            data = self._read_notice(url)
+        except PermissionError as e:
+            self._send_json(403, {"error": str(e)})
+            return
+        except (OSError, ValueError) as e:
+            self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        if source is None:
+            source = pipeline.detect_source(data)
+            if source is None:
+                self._send_json(422, {"error": "format de notice non reconnu", "sources": sorted(pipeline.NORMALIZERS)})
+                return
+
+        entry = open_entry(url.path, source)
+        try:
+            with bind_entry(entry):
+                result = pipeline.transform_notice(data, pipeline.NORMALIZERS[source])
+        except Exception as e:
+            logger.exception("Erreur lors de la transformation (%s)", source)
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        # Les libellés non résolus et les erreurs SPARQL sont signalés sans bloquer la réponse
+        self._send_json(200, result, {
+            "X-Linkedart-Source": source,
+            "X-Linkedart-Unresolved": str(len(entry["unresolved"])),
+            "X-Linkedart-Warnings": str(len(entry["warnings"])),
+            "X-Linkedart-Violations": str(len(entry["violations"])),
+        }, "application/ld+json")
+
+class TransformServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=8891, root="."):
+        super().__init__((host, port), TransformHandler)
+        self.root = os.path.realpath(root)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+class UnixTransformServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, root="."):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, TransformHandler)
+        self.root = os.path.realpath(root)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serveur de transformation Linked Art (cache de vocabulaire gardé en mémoire)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8891)
+    parser.add_argument("--socket", metavar="CHEMIN", help="écouter sur une socket Unix plutôt qu'en TCP")
+    parser.add_argument("--root", default=".", help="dossier sous lequel les notices peuvent être lues via ?path= (défaut : %(default)s)")
+    # Mêmes réglages que transformation_optimisee.py
+    parser.add_argument("--timeout", type=float, default=pipeline.LOOKUP_TIMEOUT, metavar="SECONDES", help="délai maximal d'une requête SPARQL (défaut : %(default)s)")
+    parser.add_argument("--hedge", nargs="?", type=float, const=pipeline.HEDGE_PERCENTILE, metavar="PERCENTILE", help="interroger Wikidata en parallèle si Getty n'a pas répondu après ce percentile de ses temps de réponse (défaut : %(const)s)")
+    parser.add_argument("--crosswalk", action="store_true", help="remplacer les URI Wikidata par l'URI Getty correspondante quand elle existe")
+    parser.add_argument("--validate", action="store_true", help="valider chaque objet contre un sous-ensemble du schéma Linked Art (validation.py, pas une conformité complète) ; nombre d'écarts dans l'en-tête X-Linkedart-Violations")
+    parser.add_argument("--vocab-cache", metavar="FICHIER", help="cache de vocabulaire persistant, relu au démarrage et enregistré à l'arrêt")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
+    pipeline.LOOKUP_TIMEOUT = args.timeout
+    pipeline.CROSSWALK = args.crosswalk
+    pipeline.VALIDATE = args.validate
+    if args.hedge is not None:
+        pipeline.HEDGED_LOOKUPS, pipeline.HEDGE_PERCENTILE = True, args.hedge
+    if args.vocab_cache and os.path.exists(args.vocab_cache):
+        pipeline.vocabulary_cache.load(args.vocab_cache)
+    if args.crosswalk:
+        pipeline.prefetch_crosswalk()
+
+    if args.socket:
+        server = UnixTransformServer(args.socket, args.root)
+        print(f"Écoute sur {args.socket}")
+    else:
+        server = TransformServer(args.host, args.port, args.root)
+        print(f"Écoute sur {server.url}")
+    # Arrêt propre (socket Unix supprimée) aussi sur SIGTERM
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.vocab_cache:
+            pipeline.vocabulary_cache.save(args.vocab_cache)
@@ -0,0 +1,136 @@
+import argparse, glob, json, os, shutil, zlib
+from datetime import datetime
+
+from report import RunReport
+from shared_nodes import SHARED_DIR
+from vocab_cache import CACHE_FILE, VocabularyCache
+
+# Répartition d'une transformation complète sur plusieurs machines, sans coordinateur :
+# chaque nœud lance transformation_optimisee.py --shard i/N et ne traite que les notices dont
+# l'identifiant (nom de fichier sans extension : ARK, uuid) tombe dans sa part. Le hachage (CRC32)
+# ne dépend ni de la machine ni de l'ordre de lecture : une notice appartient toujours au même shard.
+# Chaque nœud écrit dans output/shard-<i>-of-<N> ; ce module fusionne ensuite les sorties :
+#
+#   python shards.py output/shard-*-of-4 --output output --vocab-cache vocabulary_cache.json
+
+REPORT_FILE = "run_report.json"
+
+def parse_shard(spec):
+    # "i/N" (0 <= i < N) -> (i, N)
+    index, _, count = spec.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"shard invalide: {spec!r} (attendu i/N)") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"shard invalide: {spec!r} (0 <= i < N)")
+    return index, count
+
+def shard_of(name, count):
+    source_id = os.path.splitext(os.path.basename(name))[0]
+    return zlib.crc32(source_id.encode("utf-8")) % count
+
+def in_shard(name, shard):
+    return shard is None or shard_of(name, shard[1]) == shard[0]
+
+def shard_dir(output_dir, shard):
+    index, count = shard
+    return os.path.join(output_dir, f"shard-{index}-of-{count}")
+
+def merge_outputs(shard_dirs, output_dir, move=False):
+    # Notices Linked Art et entités partagées ; renvoie le nombre de fichiers fusionnés
+    transfer = shutil.move if move else shutil.copy2
+    count = 0
+    for directory in shard_dirs:
+        for subdir in ("", SHARED_DIR):
+            source = os.path.join(directory, subdir)
+            if not os.path.isdir(source):
+                continue
+            target = os.path.join(output_dir, subdir)
+            os.makedirs(target, exist_ok=True)
+            for path in glob.glob(os.path.join(source, "*.jsonld")):
+                destination = os.path.join(target, os.path.basename(path))
+                # Une entité partagée est la même dans tous les shards : la première suffit
+                if subdir and os.path.exists(destination):
+                    continue
+                transfer(path, destination)
+                count += 1
+    return count
+
+def merge_reports(shard_dirs, path):
+    merged = RunReport()
+    shards = {}
+    started, durations = [], []
+    for directory in shard_dirs:
+        report_path = os.path.join(directory, REPORT_FILE)
+        if not os.path.exists(report_path):
+            continue
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        merged.files.extend(report.get("files", []))
+        summary = report["summary"]
+        started.append(datetime.fromisoformat(summary["started_at"]))
+        durations.append(summary["duration_seconds"])
+        shards[os.path.basename(os.path.normpath(directory))] = {key: report[key] for key in ("summary", "stages", "cache") if key in report}
+    if not shards:
+        return None
+    # Les nœuds tournent en parallèle : durée du plus lent
+    merged.started_at = min(started)
+    merged.duration = max(durations)
+    result = merged.to_dict()
+    result["shards"] = shards
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    return result["summary"]
+
+def merge_caches(shard_dirs, path):
+    # Libellés -> URI et correspondances Wikidata -> Getty (clés "wd:Q…", voir crosswalk.py)
+    cache = VocabularyCache()
+    if os.path.exists(path):
+        cache.load(path)
+    for directory in shard_dirs:
+        shard_cache = os.path.join(directory, CACHE_FILE)
+        if os.path.exists(shard_cache):
+            cache.load(shard_cache)
+    return cache.save(path)
+
+def merge_corpora(shard_dirs, output_dir):
+    # Corpus Parquet des shards (--corpus), concaténés fichier par fichier ; renvoie le nombre de lignes
+    by_name = {}
+    for directory in shard_dirs:
+        for path in glob.glob(os.path.join(directory, "*.parquet")):
+            by_name.setdefault(os.path.basename(path), []).append(path)
+    if not by_name:
+        return 0
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    for name, paths in by_name.items():
+        table = pa.concat_tables([pq.read_table(path) for path in paths])
+        pq.write_table(table, os.path.join(output_dir, name))
+        rows += table.num_rows
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fusion des sorties de transformation_optimisee.py --shard i/N")
+    parser.add_argument("shards", nargs="+", metavar="DOSSIER", help="dossiers output/shard-<i>-of-<N>")
+    parser.add_argument("--output", default="output", metavar="DOSSIER", help="dossier de sortie fusionné (défaut : %(default)s)")
+    parser.add_argument("--vocab-cache", metavar="FICHIER", help="cache de vocabulaire à compléter avec ceux des shards")
+    parser.add_argument("--move", action="store_true", help="déplacer les notices au lieu de les copier")
+    args = parser.parse_args(argv)
+
+    count = merge_outputs(args.shards, args.output, args.move)
+    print(f"{count} fichiers fusionnés dans {args.output}")
+    summary = merge_reports(args.shards, os.path.join(args.output, REPORT_FILE))
+    if summary is not None:
+        print(f"Rapport : {summary['files_ok']}/{summary['files']} notices OK")
+    if args.vocab_cache:
+        print(f"Cache de vocabulaire : {merge_caches(args.shards, args.vocab_cache)} entrées dans {args.vocab_cache}")
+    rows = merge_corpora(args.shards, args.output)
+    if rows:
+        print(f"Corpus : {rows} lignes")
+
+if __name__ == "__main__":
+    main()
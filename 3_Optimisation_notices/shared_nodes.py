@@ -0,0 +1,122 @@
+import json, os, re, sys, threading, zlib
+
+from checkpoint import write_file
+from intermediate import NOT_EXPOSED_URI, NOT_FOUND_URI, NOT_SPECIFIED_URI
+
+# Sortie compacte : les entités qui reviennent d'un objet à l'autre (groupes, lieux, matériaux, types)
+# sont écrites une seule fois comme notices Linked Art autonomes, et les objets n'en gardent qu'une
+# référence {"id", "type"}. Le libellé propre à l'objet est conservé dans la référence s'il diffère
+# de celui de la notice partagée (ex. "Richelieu, salle 527" -> URI ULAN du Louvre).
+# Chaque entité est écrite dès sa première rencontre, avant la notice qui y fait référence : une
+# exécution interrompue puis reprise (--checkpoint) relit les entités déjà écrites.
+
+SHARED_TYPES = frozenset({"Group", "Place", "Material", "Type"})
+LINKED_ART_CONTEXT = "https://linked.art/ns/v1/linked-art.json"
+SHARED_DIR = "shared"
+
+# URI de remplacement (non trouvé, non renseigné, non exposé) : elles ne désignent pas une entité
+PLACEHOLDER_URIS = frozenset({NOT_FOUND_URI, NOT_SPECIFIED_URI, NOT_EXPOSED_URI})
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9]+")
+
+def record_name(uri, node_type):
+    # (http://vocab.getty.edu/tgn/1000111, Place) -> Place_http_vocab_getty_edu_tgn_1000111_<crc32>.jsonld
+    # Le schéma et le type font partie du nom, la somme de contrôle départage les URI que le nettoyage confond
+    slug = _UNSAFE_RE.sub("_", uri).strip("_")
+    return f"{node_type}_{slug}_{zlib.crc32(uri.encode('utf-8')):08x}.jsonld"
+
+class SharedNodes:
+    def __init__(self, output_dir, types=SHARED_TYPES, sync=False):
+        # Une notice par entité partagée, dans output_dir/shared ; sync : fsync de chaque notice
+        self.directory = os.path.join(output_dir, SHARED_DIR)
+        os.makedirs(self.directory, exist_ok=True)
+        self.types = types
+        self.sync = sync
+        self._lock = threading.Lock()
+        self._records = {}
+        # Entités réservées dont la notice est en cours d'écriture : (URI, type) -> Event
+        self._pending = {}
+        self.references = 0
+
+    def load(self):
+        # Entités écrites par une exécution précédente (reprise) : elles ne sont pas réécrites
+        count = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".jsonld"):
+                continue
+            with open(entry.path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            with self._lock:
+                self._records.setdefault((record["id"], record["type"]), record)
+            count += 1
+        return count
+
+    def __len__(self):
+        return len(self._records)
+
+    def _share(self, node):
+        uri = node.get("id")
+        node_type = node.get("type")
+        if node_type not in self.types or uri.__class__ is not str or uri in PLACEHOLDER_URIS:
+            return node
+        # Une même URI peut désigner un Group et un Place selon la notice : une entité par couple (URI, type)
+        key = (uri, node_type)
+        # Seule la réservation se fait sous le verrou : la notice est écrite ensuite, hors verrou
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                record = self._records[key] = {"@context": LINKED_ART_CONTEXT, **node}
+                written = self._pending[key] = threading.Event()
+                reserved = True
+            else:
+                written = self._pending.get(key)
+                reserved = False
+            self.references += 1
+        if reserved:
+            try:
+                write_file(os.path.join(self.directory, record_name(uri, node_type)), json.dumps(record, indent=2, ensure_ascii=False), self.sync)
+            except BaseException:
+                # Réservation annulée : la prochaine rencontre réessaiera l'écriture
+                with self._lock:
+                    del self._records[key]
+                    self.references -= 1
+                raise
+            finally:
+                with self._lock:
+                    del self._pending[key]
+                written.set()
+        elif written is not None:
+            # Entité en cours d'écriture par un autre thread : écrite avant la notice qui y fait référence
+            written.wait()
+            if key not in self._records:
+                with self._lock:
+                    self.references -= 1
+                return self._share(node)
+        reference = {"id": sys.intern(uri), "type": sys.intern(node_type)}
+        label = node.get("_label")
+        if label is not None and label != record.get("_label"):
+            reference["_label"] = sys.intern(label) if label.__class__ is str else label
+        return reference
+
+    def _walk(self, value):
+        if value.__class__ is list:
+            return [self._walk(item) for item in value]
+        if value.__class__ is dict:
+            shared = self._share(value)
+            if shared is not value:
+                return shared
+            for key, item in value.items():
+                if item.__class__ is dict or item.__class__ is list:
+                    value[key] = self._walk(item)
+        return value
+
+    def extract(self, document):
+        # Remplace sur place les entités partagées de la notice par leur référence
+        for key, item in document.items():
+            if item.__class__ is dict or item.__class__ is list:
+                document[key] = self._walk(item)
+        return document
+
+    def stats(self):
+        with self._lock:
+            return {"records": len(self._records), "references": self.references}
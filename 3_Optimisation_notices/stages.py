@@ -0,0 +1,75 @@
+import logging, queue, threading
+
+logger = logging.getLogger(__name__)
+
+# Marqueur de fin de flux transmis d'une étape à la suivante
+_STOP = object()
+
+class Stage:
+    __slots__ = ("name", "function", "workers")
+
+    def __init__(self, name, function, workers=1):
+        self.name = name
+        self.function = function
+        self.workers = max(1, workers)
+
+class StagedPipeline:
+    # Étapes reliées par des files bornées : chaque étape a ses propres workers et
+    # une étape lente bloque celles d'avant (backpressure) au lieu d'accumuler en mémoire.
+    def __init__(self, stages, queue_size=64, on_error=None, call=None):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.call = call or (lambda stage, item: stage.function(item))
+
+    def _worker(self, index, queues, remaining, lock):
+        stage = self.stages[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                break
+            try:
+                result = self.call(stage, item)
+            except Exception as e:
+                if self.on_error is not None:
+                    try:
+                        self.on_error(stage, item, e)
+                    except Exception:
+                        logger.exception("Erreur dans le gestionnaire d'erreurs de l'étape %s", stage.name)
+                continue
+            # None : l'élément s'arrête à cette étape
+            if result is not None and outbox is not None:
+                outbox.put(result)
+
+        # Le dernier worker de l'étape propage la fin du flux à l'étape suivante
+        with lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last and outbox is not None:
+            for _ in range(self.stages[index + 1].workers):
+                outbox.put(_STOP)
+
+    def run(self, items):
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=self._worker, args=(index, queues, remaining, lock), name=f"{stage.name}-{n}", daemon=True)
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Producteur : alimente la première étape au rythme où elle consomme
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_STOP)
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crosswalk import CACHE_PREFIX, Crosswalk, apply_crosswalk, qid
+from transformation_optimisee import SPECIAL_CASES
+from vocab_cache import VocabularyCache
+
+
+def wikidata_special_cases():
+    return sorted({uri for cases in SPECIAL_CASES.values() for table in cases.values()
+                   for uri in table.values() if "wikidata.org" in uri})
+
+
+def test_special_cases_are_recognised():
+    uris = wikidata_special_cases()
+    assert uris
+    assert all(qid(uri) for uri in uris)
+    assert qid("http://www.wikidata.org/entity/Q42") == qid("https://www.wikidata.org/wiki/Q42") == "Q42"
+
+
+def test_special_cases_rewritten_from_cache():
+    # Correspondances déjà dans le cache de vocabulaire : aucune requête distante
+    uris = wikidata_special_cases()
+    cache = VocabularyCache()
+    for uri in uris:
+        cache.put(CACHE_PREFIX + qid(uri), f"http://vocab.getty.edu/ulan/{qid(uri)[1:]}")
+    crosswalk = Crosswalk("http://invalid.example/sparql", cache)
+    crosswalk._fetch = lambda qids, timeout: (_ for _ in ()).throw(AssertionError(qids))
+
+    document = {"current_owner": [{"id": uri, "type": "Group"} for uri in uris]}
+    apply_crosswalk(document, crosswalk, timeout=1.0)
+    assert all(node["id"].startswith("http://vocab.getty.edu/ulan/") for node in document["current_owner"])
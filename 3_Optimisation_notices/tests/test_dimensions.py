@@ -0,0 +1,37 @@
+import math, sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dimensions import CANONICAL_UNIT, PARSE_CACHE_SIZE, _cached_parse_dimension, parse_dimension, unit_uri
+
+
+def test_typed_literal_value():
+    # P90 Agorha sous forme de littéral typé JSON-LD
+    assert parse_dimension({"@value": "12,5", "@type": "xsd:decimal"}, "cm") == (12.5, CANONICAL_UNIT)
+    assert parse_dimension({"@value": 8}, {"@value": "mm"}) == (0.8, CANONICAL_UNIT)
+
+
+def test_unhashable_value():
+    assert parse_dimension(["12"], "centimeters") == (12.0, CANONICAL_UNIT)
+    value, unit = parse_dimension([], None)
+    assert math.isnan(value)
+
+
+def test_unknown_unit_defaults_to_centimeters():
+    assert parse_dimension("12 x 8 cm") == (12.0, CANONICAL_UNIT)
+    assert parse_dimension("3 mètres") == (300.0, CANONICAL_UNIT)
+    assert parse_dimension("5", "pieds") == (5.0, CANONICAL_UNIT)
+
+
+def test_unit_uri_resolves_once():
+    calls = []
+    resolver = lambda unit: calls.append(unit) or f"uri:{unit}"
+    assert unit_uri("test-unit", resolver) == unit_uri("test-unit", resolver) == "uri:test-unit"
+    assert calls == ["test-unit"]
+
+
+def test_parse_cache_is_bounded():
+    for index in range(PARSE_CACHE_SIZE + 10):
+        parse_dimension(f"{index} mm")
+    assert _cached_parse_dimension.cache_info().currsize <= PARSE_CACHE_SIZE
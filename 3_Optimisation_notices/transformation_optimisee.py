@@ -1,17 +1,154 @@
-import json, os, sys, requests, re, concurrent.futures
+import json, math, os, sys, re, logging, threading, time
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait
+from dataclasses import dataclass
 from urllib.parse import urlencode
-from SPARQLWrapper import SPARQLWrapper, JSON
 
-NOT_SPECIFIED_URI = 'http://example.org/not_specified'
-NOT_FOUND_URI = 'http://example.org/not_found'
-NOT_EXPOSED_URI = 'http://example.org/not_exposed'
+from intermediate import IntermediateRecord, TimeSpan, Acquisition
+from intermediate import NOT_SPECIFIED_URI, NOT_FOUND_URI, NOT_EXPOSED_URI
+from corpus import Corpus
+from dimensions import normalize_dimensions, unit_uri
+from dates import normalize_timespans
+from vocab_cache import CACHE_FILE, VocabularyCache
+from instrumentation import Histogram, metrics
+from report import RunReport, track_file, note_uri, note_error, note_violation, open_entry, bind_entry, close_entry, current_entry
+from stages import Stage, StagedPipeline
+from paris_dump import iter_entities
+from louvre_export import iter_china_objects, louvre_ark
+from archives import is_archive, iter_members, member_name
+from shared_nodes import SharedNodes
+from materials import louvre_materials
+from validation import validate_linked_art
+from shards import in_shard, parse_shard, shard_dir
+from checkpoint import Checkpoint, write_file
+from framing import frame_notice
+from crosswalk import Crosswalk, apply_crosswalk, qid
+
+logger = logging.getLogger(__name__)
+
+# requests et SPARQLWrapper (qui charge rdflib) ne sont importés qu'à la première
+# recherche distante : une exécution résolue par le cache démarre sans eux.
+
+# Points d'accès SPARQL (surchargés par le benchmark hors ligne)
+GETTY_SPARQL_ENDPOINT = os.environ.get("GETTY_SPARQL_ENDPOINT", "https://vocab.getty.edu/sparql")
+WIKIDATA_SPARQL_ENDPOINT = os.environ.get("WIKIDATA_SPARQL_ENDPOINT", "https://query.wikidata.org/sparql")
+
+# Délai maximal d'une requête SPARQL (secondes) : un point d'accès bloqué ne retient plus un worker
+LOOKUP_TIMEOUT = float(os.environ.get("LOOKUP_TIMEOUT", "10"))
+
+# Recherches couvertes : si Getty n'a pas répondu après le percentile HEDGE_PERCENTILE de ses
+# temps de réponse observés, Wikidata est interrogé en parallèle ; la réponse de Getty reste prioritaire
+HEDGED_LOOKUPS = False
+HEDGE_PERCENTILE = 0.95
+# Délai utilisé tant que trop peu de réponses Getty ont été mesurées
+HEDGE_DEFAULT_DELAY = 0.5
+HEDGE_MIN_SAMPLES = 20
+# Avance laissée à Getty une fois que Wikidata a trouvé une URI
+HEDGE_GRACE = 0.05
+HEDGE_WORKERS = 32
+
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+# Temps de réponse des requêtes Getty abouties (les erreurs et délais dépassés fausseraient le percentile)
+_getty_latency = Histogram()
+
+# Cache partagé des recherches distantes (libellé normalisé -> URI)
+vocabulary_cache = VocabularyCache()
+metrics.cache = vocabulary_cache
+
+# Validation des objets produits contre un sous-ensemble du schéma Linked Art (--validate, voir validation.py), écarts dans le rapport
+VALIDATE = False
+
+# Journal de reprise (--checkpoint) : notices terminées, sautées si l'exécution est relancée
+CHECKPOINT = None
+
+# Sortie compacte (--shared-nodes) : entités partagées écrites une fois dans output/shared
+SHARED_NODES = None
+
+# URI Wikidata remplacées par l'URI Getty correspondante (AAT, TGN, ULAN) quand elle existe
+# (--crosswalk : requêtes supplémentaires vers Wikidata, désactivé par défaut)
+CROSSWALK = False
+crosswalk = Crosswalk(WIKIDATA_SPARQL_ENDPOINT, vocabulary_cache)
+
+def hedge_delay():
+    with _hedge_pool_lock:
+        if _getty_latency.count < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return _getty_latency.quantile(HEDGE_PERCENTILE)
+
+def _submit_lookup(function):
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _hedge_pool_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(HEDGE_WORKERS, thread_name_prefix="lookup")
+
+    # Les erreurs notées pendant la recherche restent rattachées au fichier en cours
+    entry = current_entry()
+    def run():
+        with bind_entry(entry):
+            return function()
+    return _hedge_pool.submit(run)
+
+def lookup_deadline():
+    # Échéance absolue d'une recherche de libellé, toutes tentatives comprises (Getty, Wikidata, parties)
+    return time.monotonic() + LOOKUP_TIMEOUT
+
+def time_left(deadline):
+    # Délai restant pour la prochaine requête ; échéance passée : les tentatives restantes sont abandonnées
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError(f"recherche abandonnée après {LOOKUP_TIMEOUT} s")
+    return remaining
+
+def hedged_lookup(preferred, fallback, deadline=None):
+    # preferred (Getty) est lancé seul ; s'il tarde, fallback (Wikidata) part en parallèle.
+    # La réponse de preferred l'emporte si elle arrive avant celle de fallback (à HEDGE_GRACE près),
+    # ou avant l'échéance (absolue, time.monotonic()) si fallback n'a rien trouvé.
+    deadline = lookup_deadline() if deadline is None else deadline
+    remaining = lambda: max(0.0, deadline - time.monotonic())
+
+    first = _submit_lookup(preferred)
+    try:
+        return first.result(timeout=min(hedge_delay(), remaining()))
+    except FuturesTimeout:
+        pass
+    except Exception:
+        # Getty en erreur et Wikidata sans résultat : échec (non mis en cache), pas une réponse négative
+        uri = fallback()
+        if uri is None:
+            raise
+        return uri
+
+    second = _submit_lookup(fallback)
+    wait((first, second), timeout=remaining(), return_when=FIRST_COMPLETED)
+    if not first.done():
+        found = second.done() and second.exception() is None and second.result() is not None
+        wait((first,), timeout=min(HEDGE_GRACE, remaining()) if found else remaining())
+    if first.done() and first.exception() is None:
+        return first.result()
+    # Getty en erreur ou hors délai : réponse de Wikidata, déjà en cours, attendue jusqu'à l'échéance
+    try:
+        uri = second.result(timeout=remaining())
+    except FuturesTimeout:
+        raise TimeoutError("ni Getty ni Wikidata n'ont répondu avant l'échéance") from None
+    if uri is None:
+        if first.done():
+            raise first.exception()
+        raise TimeoutError("Getty n'a pas répondu avant l'échéance, rien trouvé sur Wikidata")
+    return uri
 
 def get_getty_uri_from_label(label, special_cases=None):
-    def get_wikidata_uri(label):
-        endpoint_url = "https://query.wikidata.org/sparql"
+    def get_wikidata_uri(label, deadline):
+        endpoint_url = WIKIDATA_SPARQL_ENDPOINT
+        errors = []
 
         def run_query(search_label):
+            try:
+                timeout = time_left(deadline)
+            except TimeoutError as e:
+                errors.append(e)
+                return None
             query = f"""
             SELECT ?item WHERE {{
                 SERVICE wikibase:mwapi {{
@@ -23,18 +160,25 @@ def get_getty_uri_from_label(label, special_cases=None):
                 }}
             }} LIMIT 1
             """
+            from SPARQLWrapper import SPARQLWrapper, JSON
+
             user_agent = "WDQS-example Python/%s.%s" % (sys.version_info[0], sys.version_info[1])
             sparql = SPARQLWrapper(endpoint_url, agent=user_agent)
             sparql.setQuery(query)
             sparql.setReturnFormat(JSON)
+            # SPARQLWrapper n'accepte qu'un nombre entier de secondes
+            sparql.setTimeout(max(1, math.ceil(timeout)))
 
             try:
-                results = sparql.query().convert()
+                with metrics.lookup("endpoint", "wikidata"):
+                    results = sparql.query().convert()
                 bindings = results["results"]["bindings"]
                 if bindings:
                     return bindings[0]["item"]["value"]
             except Exception as e:
-                print(f"SPARQL error: {e}")
+                logger.warning("SPARQL error: %s", e)
+                note_error(f"wikidata: {e}")
+                errors.append(e)
             return None
 
         # Essayer d’abord l’étiquette complète
@@ -42,11 +186,15 @@ def get_getty_uri_from_label(label, special_cases=None):
         if result:
             return result
 
+        # Échéance passée : les parties restantes sont sautées (run_query ne fait plus de requête)
         for part in label.split(','):
             result = run_query(part)
             if result:
                 return result
 
+        # Rien trouvé parce qu'une requête a échoué : erreur transitoire, à ne pas mettre en cache
+        if errors:
+            raise errors[0]
         return None
     # -----
     if not label:
@@ -60,48 +208,103 @@ def get_getty_uri_from_label(label, special_cases=None):
             if key.strip().lower() in label_clean:
                 return uri
 
-    # Requête SPARQL plus souple
-    query = f"""
-    PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-    SELECT DISTINCT ?subj WHERE {{
-        ?subj skos:prefLabel ?lab .
-        FILTER(LCASE(STR(?lab)) = "{label_clean}")
-    }} LIMIT 1
-    """
-    params = {
-        "query": query,
-        "format": "application/sparql-results+json"
-    }
-    url = f"https://vocab.getty.edu/sparql?{urlencode(params)}"
-
-    try:
-        response = requests.get(url, headers={"Accept": "application/sparql-results+json"})
-        response.raise_for_status()
+    def get_getty_uri(label_clean, deadline):
+        import requests
+
+        # Requête SPARQL plus souple
+        query = f"""
+        PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+        SELECT DISTINCT ?subj WHERE {{
+            ?subj skos:prefLabel ?lab .
+            FILTER(LCASE(STR(?lab)) = "{label_clean}")
+        }} LIMIT 1
+        """
+        params = {
+            "query": query,
+            "format": "application/sparql-results+json"
+        }
+        url = f"{GETTY_SPARQL_ENDPOINT}?{urlencode(params)}"
+
+        start = time.perf_counter()
+        with metrics.lookup("endpoint", "getty"):
+            response = requests.get(url, headers={"Accept": "application/sparql-results+json"}, timeout=time_left(deadline))
+            response.raise_for_status()
+        with _hedge_pool_lock:
+            _getty_latency.observe(time.perf_counter() - start)
         results = response.json().get("results", {}).get("bindings", [])
         return results[0]["subj"]["value"] if results else None
-    except Exception as e:
-        # Logique Wikidata ici
+
+    def remote_lookup():
+        # Une seule échéance pour toutes les requêtes du libellé
+        deadline = lookup_deadline()
+        if HEDGED_LOOKUPS:
+            return hedged_lookup(lambda: get_getty_uri(label_clean, deadline), lambda: get_wikidata_uri(label_clean, deadline), deadline)
         try:
-            return get_wikidata_uri(label_clean)
-        except Exception as e1:
-            print(f"Erreur lors de la récupération des données pour '{label}': {e1}")
-            return None
+            return get_getty_uri(label_clean, deadline)
+        except Exception as e:
+            # Logique Wikidata ici ; Getty en erreur et Wikidata sans résultat : échec, non mis en cache
+            logger.info("Getty indisponible pour '%s' (%s), recherche Wikidata", label_clean, e)
+            uri = get_wikidata_uri(label_clean, deadline)
+            if uri is None:
+                raise
+            return uri
+
+    # Cache partagé par tous les musées : chaque libellé n'est cherché qu'une fois par exécution ;
+    # une recherche en échec n'est ni gardée ni enregistrée (retentée à la prochaine occurrence)
+    try:
+        return vocabulary_cache.resolve(label_clean, remote_lookup)
+    except Exception as e1:
+        logger.warning("Erreur lors de la récupération des données pour '%s': %s", label, e1)
+        note_error(f"getty/wikidata '{label}': {e1}")
+        return None
 
 def uri_searcher(label, key, museum="louvre"):
+    with metrics.lookup("uri_searcher", key):
+        uri = _uri_searcher(label, key, museum)
+    note_uri(key, label, uri)
+    # QID mis en file pour la correspondance dès sa résolution : un lot pour toutes les notices en cours
+    if CROSSWALK and qid(uri):
+        crosswalk.prefetch([qid(uri)], LOOKUP_TIMEOUT)
+    return uri
+
+# Correspondances libellé -> URI connues d'avance, par musée puis par clé Linked Art ;
+# construites une seule fois au chargement du module
+SPECIAL_CASES = {
+    "louvre": {
+        "took_place_at": {"chine": "http://vocab.getty.edu/tgn/1000111"},
+        "member_of":{"Département des Antiquités égyptiennes":"https://www.wikidata.org/wiki/Q3044749","Département des Objets d'art du Moyen Age, de la Renaissance et des temps modernes":"https://www.wikidata.org/wiki/Q3044767","Service de l'Histoire du Louvre":"https://www.wikidata.org/wiki/Q106824040","Département des Arts de l'Islam":"https://www.wikidata.org/wiki/Q3044748","Musée national Eugène-Delacroix":"https://vocab.getty.edu/ulan/500310018","Département des Arts graphiques":"https://www.wikidata.org/wiki/Q3044753"},
+        "current_owner": {"etat": "http://vocab.getty.edu/tgn/1000070","Musées Nationaux Récupération":"https://www.wikidata.org/wiki/Q19013512"},
+        "current_permanent_custodian":{"louvre": "http://vocab.getty.edu/ulan/500125189","Union centrale des Arts Décoratifs":"https://vocab.getty.edu/ulan/500256748","Delacroix":"https://vocab.getty.edu/ulan/500310018"},
+        "current_custodian": {"louvre":"http://vocab.getty.edu/ulan/500125189","Guimet":"https://vocab.getty.edu/ulan/500275906","Versailles":"https://vocab.getty.edu/ulan/500312482","FNAGP":"https://www.wikidata.org/wiki/Q3075687"},
+        "current_location": {"non exposé": NOT_EXPOSED_URI,"Denon":"http://vocab.getty.edu/ulan/500125189","Sully":"http://vocab.getty.edu/ulan/500125189","Versailles":"https://vocab.getty.edu/ulan/500312482","Guimet":"https://vocab.getty.edu/ulan/500275906","FNAGP":"https://www.wikidata.org/wiki/Q3075687","Napoléon":"http://vocab.getty.edu/ulan/500125189","Richelieu":"http://vocab.getty.edu/ulan/500125189", "Abu Dhabi":"https://www.wikidata.org/wiki/Q3176133","Strasbourg":"https://www.wikidata.org/wiki/Q630461","Delacroix":"https://vocab.getty.edu/ulan/500310018","petit format":"http://vocab.getty.edu/ulan/500125189","Réserve Edmond de Rothschild":"http://vocab.getty.edu/ulan/500125189","Réserve des autographes":"http://vocab.getty.edu/ulan/500125189","Réserve des petits albums":"http://vocab.getty.edu/ulan/500125189"},
+        "made_of": {"textile":"http://vocab.getty.edu/aat/300231566","acier":"http://vocab.getty.edu/aat/300133751","agate":"http://vocab.getty.edu/aat/300011135","bambou":"http://vocab.getty.edu/aat/300011873","bois":"http://vocab.getty.edu/aat/300011915","bronze":"http://vocab.getty.edu/aat/300010957","burgau":"https://vocab.getty.edu/ulan/500296560","coton":"http://vocab.getty.edu/aat/300014067","cristal de roche":"http://vocab.getty.edu/aat/300011152","cuivre":"http://vocab.getty.edu/aat/300011020","faïence":"http://vocab.getty.edu/aat/300265183","ivoire":"http://vocab.getty.edu/aat/300011857","jade":"http://vocab.getty.edu/aat/300011119","jadéite":"http://vocab.getty.edu/aat/300011119","jaspe":"http://vocab.getty.edu/aat/300011151","métal":"http://vocab.getty.edu/aat/300010900","onyx":"http://vocab.getty.edu/aat/300011337","papier":"http://vocab.getty.edu/aat/300014110","pierre":"http://vocab.getty.edu/aat/300011670","porcelaine":"http://vocab.getty.edu/aat/300010662","soie":"http://vocab.getty.edu/aat/300014072","terre cuite":"http://vocab.getty.edu/aat/300020133","verre":"http://vocab.getty.edu/aat/300010799"},
+    },
+    "paris_musees": {
+        "took_place_at": {"chine": "http://vocab.getty.edu/tgn/1000111"},
+        "current_location": {"Cernuschi":"https://www.wikidata.org/wiki/Q1667022","Petit Palais":"https://vocab.getty.edu/ulan/500310009","Cognacq-Jay":"https://vocab.getty.edu/ulan/500309999","Galliera":"https://www.wikidata.org/wiki/Q1632912","Carnavalet":"https://vocab.getty.edu/ulan/500214785"},
+        "member_of":{"Département des Antiquités égyptiennes":"https://www.wikidata.org/wiki/Q3044749","Département des Objets d'art du Moyen Age, de la Renaissance et des temps modernes":"https://www.wikidata.org/wiki/Q3044767","Service de l'Histoire du Louvre":"https://www.wikidata.org/wiki/Q106824040","Département des Arts de l'Islam":"https://www.wikidata.org/wiki/Q3044748","Musée national Eugène-Delacroix":"https://vocab.getty.edu/ulan/500310018","Département des Arts graphiques":"https://www.wikidata.org/wiki/Q3044753"},
+        "current_owner": {"etat": "http://vocab.getty.edu/tgn/1000070","Musées Nationaux Récupération":"https://www.wikidata.org/wiki/Q19013512"},
+        "current_permanent_custodian":{"louvre": "http://vocab.getty.edu/ulan/500125189","Union centrale des Arts Décoratifs":"https://vocab.getty.edu/ulan/500256748","Delacroix":"https://vocab.getty.edu/ulan/500310018"},
+        "current_custodian": {"louvre":"http://vocab.getty.edu/ulan/500125189","Guimet":"https://vocab.getty.edu/ulan/500275906","Versailles":"https://vocab.getty.edu/ulan/500312482","FNAGP":"https://www.wikidata.org/wiki/Q3075687"},
+        "made_of": {"bronze":"https://vocab.getty.edu/aat/300010957","céramique":"https://vocab.getty.edu/aat/300235507","porcelaine":"https://vocab.getty.edu/aat/300010662","laque":"https://vocab.getty.edu/aat/300014916","bois":"https://vocab.getty.edu/aat/300011915","jade":"https://vocab.getty.edu/aat/300011119","grès":"https://vocab.getty.edu/aat/300011383","crin":"https://vocab.getty.edu/aat/300011819","soie":"https://vocab.getty.edu/aat/300014072","paillette":"https://vocab.getty.edu/aat/300014655","ecaille":"https://vocab.getty.edu/aat/300425558","métal":"https://vocab.getty.edu/aat/300010900","nacre":"https://vocab.getty.edu/aat/300011835","ivoire":"https://vocab.getty.edu/aat/300011857","argent":"https://vocab.getty.edu/aat/300011029","papier":"https://vocab.getty.edu/aat/300014110","gouache":"https://vocab.getty.edu/aat/300070114","velours":"https://vocab.getty.edu/aat/300014080","feuille d'or":"https://vocab.getty.edu/aat/300264831"},
+    },
+    "agorha": {
+        "took_place_at": {"chine": "http://vocab.getty.edu/tgn/1000111"},
+        "current_location": {"Louvre":"https://vocab.getty.edu/ulan/500125189","Fondation des artistes":"https://www.wikidata.org/wiki/Q3075687","Localisation inconnue":NOT_EXPOSED_URI,"Bibliothèque municipale (Lyon)":"https://www.wikidata.org/wiki/Q8622","Unknown":NOT_EXPOSED_URI,"Musée Angladon":"https://vocab.getty.edu/ulan/500265588","BnF":"https://vocab.getty.edu/ulan/500309981","Guimet":"https://vocab.getty.edu/ulan/500275906","Metropolitan Museum of Art":"https://vocab.getty.edu/ulan/500125157","Cernuschi":"https://www.wikidata.org/wiki/Q1667022"},
+        "current_owner": {"Louvre":"https://vocab.getty.edu/ulan/500125189", "Bibliothèque nationale de France":"https://vocab.getty.edu/ulan/500309981","Heidelberg":"https://vocab.getty.edu/ulan/500307995","Ministère de la Culture":"https://vocab.getty.edu/ulan/500257707","Asia Art Archive":"https://www.wikidata.org/wiki/Q4806343","Metropolitan Museum of Art":"https://vocab.getty.edu/ulan/500125157","Academia.edu":"https://www.wikidata.org/wiki/Q2777905","Paris Musées":"https://www.wikidata.org/wiki/Q3365279"},
+        "member_of":{"Département des Antiquités égyptiennes":"https://www.wikidata.org/wiki/Q3044749","Département des Objets d'art du Moyen Age, de la Renaissance et des temps modernes":"https://www.wikidata.org/wiki/Q3044767","Service de l'Histoire du Louvre":"https://www.wikidata.org/wiki/Q106824040","Département des Arts de l'Islam":"https://www.wikidata.org/wiki/Q3044748","Musée national Eugène-Delacroix":"https://vocab.getty.edu/ulan/500310018","Département des Arts graphiques":"https://www.wikidata.org/wiki/Q3044753"},
+        "current_permanent_custodian":{"louvre": "http://vocab.getty.edu/ulan/500125189","Union centrale des Arts Décoratifs":"https://vocab.getty.edu/ulan/500256748","Delacroix":"https://vocab.getty.edu/ulan/500310018"},
+        "current_custodian": {"louvre":"http://vocab.getty.edu/ulan/500125189","Guimet":"https://vocab.getty.edu/ulan/500275906","Versailles":"https://vocab.getty.edu/ulan/500312482","FNAGP":"https://www.wikidata.org/wiki/Q3075687"},
+        "made_of": {"bronze":"https://vocab.getty.edu/aat/300010957","porcelaine":"https://vocab.getty.edu/aat/300010662","jade":"https://vocab.getty.edu/aat/300011119","céramique":"https://vocab.getty.edu/aat/300235507","soie":"https://vocab.getty.edu/aat/300014072","terre":"https://vocab.getty.edu/aat/300020133","céladon":"https://vocab.getty.edu/aat/300015100","noir de carbone":"https://vocab.getty.edu/aat/300013138","ocre":"https://vocab.getty.edu/aat/300013385","hématite":"https://vocab.getty.edu/aat/300011105","carbonate de calcium":"https://vocab.getty.edu/aat/300212174","argile":"https://vocab.getty.edu/aat/300010439","quartz":"https://vocab.getty.edu/aat/300011132","noir d'os":"https://vocab.getty.edu/aat/300013147","argent":"https://vocab.getty.edu/aat/300011029","biscuit":"https://vocab.getty.edu/aat/300242297","bistre":"https://vocab.getty.edu/aat/300013351","pierre":"https://vocab.getty.edu/aat/300011670","or":"https://vocab.getty.edu/aat/300011021","cuivre":"https://vocab.getty.edu/aat/300011020","marbre":"https://vocab.getty.edu/aat/300011443","vermillon":"https://vocab.getty.edu/aat/300013568","bleu de fer":"https://vocab.getty.edu/aat/300013315","sulfate de calcium":"https://vocab.getty.edu/aat/300011099","oxyde de plomb":"https://vocab.getty.edu/aat/300013921","peinture":"https://vocab.getty.edu/aat/300015029","papier":"https://vocab.getty.edu/aat/300014110","carton-pâte":"https://vocab.getty.edu/aat/300014224"},
+    },
+}
+
+def _uri_searcher(label, key, museum):
     if label == "Not Specified":
         return NOT_SPECIFIED_URI
 
+    special_cases_per_key = SPECIAL_CASES[museum]
     if museum == "louvre":
-        special_cases_per_key = {
-            "took_place_at": {"chine": "http://vocab.getty.edu/tgn/1000111"},
-            "member_of":{"Département des Antiquités égyptiennes":"https://www.wikidata.org/wiki/Q3044749","Département des Objets d'art du Moyen Age, de la Renaissance et des temps modernes":"https://www.wikidata.org/wiki/Q3044767","Service de l'Histoire du Louvre":"https://www.wikidata.org/wiki/Q106824040","Département des Arts de l'Islam":"https://www.wikidata.org/wiki/Q3044748","Musée national Eugène-Delacroix":"https://vocab.getty.edu/ulan/500310018","Département des Arts graphiques":"https://www.wikidata.org/wiki/Q3044753"},
-            "current_owner": {"etat": "http://vocab.getty.edu/tgn/1000070","Musées Nationaux Récupération":"https://www.wikidata.org/wiki/Q19013512"},
-            "current_permanent_custodian":{"louvre": "http://vocab.getty.edu/ulan/500125189","Union centrale des Arts Décoratifs":"https://vocab.getty.edu/ulan/500256748","Delacroix":"https://vocab.getty.edu/ulan/500310018"},
-            "current_custodian": {"louvre":"http://vocab.getty.edu/ulan/500125189","Guimet":"https://vocab.getty.edu/ulan/500275906","Versailles":"https://vocab.getty.edu/ulan/500312482","FNAGP":"https://www.wikidata.org/wiki/Q3075687"},
-            "current_location": {"non exposé": NOT_EXPOSED_URI,"Denon":"http://vocab.getty.edu/ulan/500125189","Sully":"http://vocab.getty.edu/ulan/500125189","Versailles":"https://vocab.getty.edu/ulan/500312482","Guimet":"https://vocab.getty.edu/ulan/500275906","FNAGP":"https://www.wikidata.org/wiki/Q3075687","Napoléon":"http://vocab.getty.edu/ulan/500125189","Richelieu":"http://vocab.getty.edu/ulan/500125189", "Abu Dhabi":"https://www.wikidata.org/wiki/Q3176133","Strasbourg":"https://www.wikidata.org/wiki/Q630461","Delacroix":"https://vocab.getty.edu/ulan/500310018","petit format":"http://vocab.getty.edu/ulan/500125189","Réserve Edmond de Rothschild":"http://vocab.getty.edu/ulan/500125189","Réserve des autographes":"http://vocab.getty.edu/ulan/500125189","Réserve des petits albums":"http://vocab.getty.edu/ulan/500125189"},
-            "made_of": {"textile":"http://vocab.getty.edu/aat/300231566","acier":"http://vocab.getty.edu/aat/300133751","agate":"http://vocab.getty.edu/aat/300011135","bambou":"http://vocab.getty.edu/aat/300011873","bois":"http://vocab.getty.edu/aat/300011915","bronze":"http://vocab.getty.edu/aat/300010957","burgau":"https://vocab.getty.edu/ulan/500296560","coton":"http://vocab.getty.edu/aat/300014067","cristal de roche":"http://vocab.getty.edu/aat/300011152","cuivre":"http://vocab.getty.edu/aat/300011020","faïence":"http://vocab.getty.edu/aat/300265183","ivoire":"http://vocab.getty.edu/aat/300011857","jade":"http://vocab.getty.edu/aat/300011119","jadéite":"http://vocab.getty.edu/aat/300011119","jaspe":"http://vocab.getty.edu/aat/300011151","métal":"http://vocab.getty.edu/aat/300010900","onyx":"http://vocab.getty.edu/aat/300011337","papier":"http://vocab.getty.edu/aat/300014110","pierre":"http://vocab.getty.edu/aat/300011670","porcelaine":"http://vocab.getty.edu/aat/300010662","soie":"http://vocab.getty.edu/aat/300014072","terre cuite":"http://vocab.getty.edu/aat/300020133","verre":"http://vocab.getty.edu/aat/300010799"},
-        }
-
         # Cas Particulier pour Louvre
         if key == "made_of":
             match = re.search(r"Matériau\s*:\s*(.*?)(\r?\n|$)", label)
@@ -109,16 +312,6 @@ def uri_searcher(label, key, museum="louvre"):
                 label = match.group(1)
 
     elif museum == "paris_musees":
-        special_cases_per_key = {
-            "took_place_at": {"chine": "http://vocab.getty.edu/tgn/1000111"},
-            "current_location": {"Cernuschi":"https://www.wikidata.org/wiki/Q1667022","Petit Palais":"https://vocab.getty.edu/ulan/500310009","Cognacq-Jay":"https://vocab.getty.edu/ulan/500309999","Galliera":"https://www.wikidata.org/wiki/Q1632912","Carnavalet":"https://vocab.getty.edu/ulan/500214785"},
-            "member_of":{"Département des Antiquités égyptiennes":"https://www.wikidata.org/wiki/Q3044749","Département des Objets d'art du Moyen Age, de la Renaissance et des temps modernes":"https://www.wikidata.org/wiki/Q3044767","Service de l'Histoire du Louvre":"https://www.wikidata.org/wiki/Q106824040","Département des Arts de l'Islam":"https://www.wikidata.org/wiki/Q3044748","Musée national Eugène-Delacroix":"https://vocab.getty.edu/ulan/500310018","Département des Arts graphiques":"https://www.wikidata.org/wiki/Q3044753"},
-            "current_owner": {"etat": "http://vocab.getty.edu/tgn/1000070","Musées Nationaux Récupération":"https://www.wikidata.org/wiki/Q19013512"},
-            "current_permanent_custodian":{"louvre": "http://vocab.getty.edu/ulan/500125189","Union centrale des Arts Décoratifs":"https://vocab.getty.edu/ulan/500256748","Delacroix":"https://vocab.getty.edu/ulan/500310018"},
-            "current_custodian": {"louvre":"http://vocab.getty.edu/ulan/500125189","Guimet":"https://vocab.getty.edu/ulan/500275906","Versailles":"https://vocab.getty.edu/ulan/500312482","FNAGP":"https://www.wikidata.org/wiki/Q3075687"},
-            "made_of": {"bronze":"https://vocab.getty.edu/aat/300010957","céramique":"https://vocab.getty.edu/aat/300235507","porcelaine":"https://vocab.getty.edu/aat/300010662","laque":"https://vocab.getty.edu/aat/300014916","bois":"https://vocab.getty.edu/aat/300011915","jade":"https://vocab.getty.edu/aat/300011119","grès":"https://vocab.getty.edu/aat/300011383","crin":"https://vocab.getty.edu/aat/300011819","soie":"https://vocab.getty.edu/aat/300014072","paillette":"https://vocab.getty.edu/aat/300014655","ecaille":"https://vocab.getty.edu/aat/300425558","métal":"https://vocab.getty.edu/aat/300010900","nacre":"https://vocab.getty.edu/aat/300011835","ivoire":"https://vocab.getty.edu/aat/300011857","argent":"https://vocab.getty.edu/aat/300011029","papier":"https://vocab.getty.edu/aat/300014110","gouache":"https://vocab.getty.edu/aat/300070114","velours":"https://vocab.getty.edu/aat/300014080","feuille d'or":"https://vocab.getty.edu/aat/300264831"},
-        }
-
         # Cas Particulier pour Paris Musées
         if key == "made_of":
             label_clean = label.strip().lower()
@@ -131,16 +324,6 @@ def uri_searcher(label, key, museum="louvre"):
             return NOT_SPECIFIED_URI
 
     elif museum == "agorha":
-        special_cases_per_key = {
-            "took_place_at": {"chine": "http://vocab.getty.edu/tgn/1000111"},
-            "current_location": {"Louvre":"https://vocab.getty.edu/ulan/500125189","Fondation des artistes":"https://www.wikidata.org/wiki/Q3075687","Localisation inconnue":NOT_EXPOSED_URI,"Bibliothèque municipale (Lyon)":"https://www.wikidata.org/wiki/Q8622","Unknown":NOT_EXPOSED_URI,"Musée Angladon":"https://vocab.getty.edu/ulan/500265588","BnF":"https://vocab.getty.edu/ulan/500309981","Guimet":"https://vocab.getty.edu/ulan/500275906","Metropolitan Museum of Art":"https://vocab.getty.edu/ulan/500125157","Cernuschi":"https://www.wikidata.org/wiki/Q1667022"},
-            "current_owner": {"Louvre":"https://vocab.getty.edu/ulan/500125189", "Bibliothèque nationale de France":"https://vocab.getty.edu/ulan/500309981","Heidelberg":"https://vocab.getty.edu/ulan/500307995","Ministère de la Culture":"https://vocab.getty.edu/ulan/500257707","Asia Art Archive":"https://www.wikidata.org/wiki/Q4806343","Metropolitan Museum of Art":"https://vocab.getty.edu/ulan/500125157","Academia.edu":"https://www.wikidata.org/wiki/Q2777905","Paris Musées":"https://www.wikidata.org/wiki/Q3365279"},
-            "member_of":{"Département des Antiquités égyptiennes":"https://www.wikidata.org/wiki/Q3044749","Département des Objets d'art du Moyen Age, de la Renaissance et des temps modernes":"https://www.wikidata.org/wiki/Q3044767","Service de l'Histoire du Louvre":"https://www.wikidata.org/wiki/Q106824040","Département des Arts de l'Islam":"https://www.wikidata.org/wiki/Q3044748","Musée national Eugène-Delacroix":"https://vocab.getty.edu/ulan/500310018","Département des Arts graphiques":"https://www.wikidata.org/wiki/Q3044753"},
-            "current_permanent_custodian":{"louvre": "http://vocab.getty.edu/ulan/500125189","Union centrale des Arts Décoratifs":"https://vocab.getty.edu/ulan/500256748","Delacroix":"https://vocab.getty.edu/ulan/500310018"},
-            "current_custodian": {"louvre":"http://vocab.getty.edu/ulan/500125189","Guimet":"https://vocab.getty.edu/ulan/500275906","Versailles":"https://vocab.getty.edu/ulan/500312482","FNAGP":"https://www.wikidata.org/wiki/Q3075687"},
-            "made_of": {"bronze":"https://vocab.getty.edu/aat/300010957","porcelaine":"https://vocab.getty.edu/aat/300010662","jade":"https://vocab.getty.edu/aat/300011119","céramique":"https://vocab.getty.edu/aat/300235507","soie":"https://vocab.getty.edu/aat/300014072","terre":"https://vocab.getty.edu/aat/300020133","céladon":"https://vocab.getty.edu/aat/300015100","noir de carbone":"https://vocab.getty.edu/aat/300013138","ocre":"https://vocab.getty.edu/aat/300013385","hématite":"https://vocab.getty.edu/aat/300011105","carbonate de calcium":"https://vocab.getty.edu/aat/300212174","argile":"https://vocab.getty.edu/aat/300010439","quartz":"https://vocab.getty.edu/aat/300011132","noir d'os":"https://vocab.getty.edu/aat/300013147","argent":"https://vocab.getty.edu/aat/300011029","biscuit":"https://vocab.getty.edu/aat/300242297","bistre":"https://vocab.getty.edu/aat/300013351","pierre":"https://vocab.getty.edu/aat/300011670","or":"https://vocab.getty.edu/aat/300011021","cuivre":"https://vocab.getty.edu/aat/300011020","marbre":"https://vocab.getty.edu/aat/300011443","vermillon":"https://vocab.getty.edu/aat/300013568","bleu de fer":"https://vocab.getty.edu/aat/300013315","sulfate de calcium":"https://vocab.getty.edu/aat/300011099","oxyde de plomb":"https://vocab.getty.edu/aat/300013921","peinture":"https://vocab.getty.edu/aat/300015029","papier":"https://vocab.getty.edu/aat/300014110","carton-pâte":"https://vocab.getty.edu/aat/300014224"},
-        }
-
         # Cas Particulier pour Agorha
         if key == "made_of":
             label_clean = label.strip().lower()
@@ -162,28 +345,36 @@ def uri_searcher(label, key, museum="louvre"):
     return NOT_SPECIFIED_URI
 
 def create_intermediate_representation_agorha(data):
+    def as_list(value):
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
     def get_inventory_number(data):
         permanent_location = data.get("crm:P54_has_current_permanent_location")
         if permanent_location:
             # IVoir si c'est une liste
             if isinstance(permanent_location, list):
-                content = data["crm:P54_has_current_permanent_location"][1].get("crm:P87_is_identified_by")
+                location = permanent_location[1] if len(permanent_location) > 1 else permanent_location[0]
+                content = location.get("crm:P87_is_identified_by")
                 if content:
                     content = content["rdfs:label"]
                 else:
-                    content = permanent_location[1]["crm:P3_has_note"]
+                    content = location.get("crm:P3_has_note", "Not Specified")
             # Pas de liste externe mais une liste interne
             elif isinstance(permanent_location["crm:P87_is_identified_by"], list):
                 content = permanent_location["crm:P87_is_identified_by"][1]['rdfs:label']
             else:
-                content = data["crm:P54_has_current_permanent_location"]["crm:P87_is_identified_by"]["crm:P1_is_identified_by"]["crm:P87_is_identified_by"]["rdfs:label"]
+                content = permanent_location["crm:P87_is_identified_by"]["crm:P1_is_identified_by"]["crm:P87_is_identified_by"]["rdfs:label"]
             return content
         return "Not Specified"
+
     def extract_timespan(data):
         production_data = data.get("crm:P108i_was_produced_by")
 
+        # Plusieurs productions : la datation est portée par la seconde
         if isinstance(production_data, list):
-            production_event = production_data[1]
+            production_event = production_data[1] if len(production_data) > 1 else production_data[0]
         else:
             production_event = production_data
 
@@ -201,11 +392,11 @@ def create_intermediate_representation_agorha(data):
         begin_of_the_begin = time_span.get("crm:P82a_begin_of_the_begin", "Not Specified")
         end_of_the_end = time_span.get("crm:P82b_end_of_the_end", "Not Specified")
 
-        return {
-            "creation_date": label,
-            "beginning": begin_of_the_begin,
-            "end": end_of_the_end,
-        }
+        return TimeSpan(
+            creation_date=label,
+            beginning=begin_of_the_begin,
+            end=end_of_the_end,
+        )
 
     def extract_place_of_creation(data):
         productions = data.get("crm:P108i_was_produced_by")
@@ -214,15 +405,12 @@ def create_intermediate_representation_agorha(data):
             return None
 
         # S’assurer que c’est une liste pour un traitement uniforme
-        if not isinstance(productions, list):
-            productions = [productions]
-
-        for production in productions:
+        for production in as_list(productions):
             place = production.get("crm:P7_took_place_at")
             if place:
-                identified_by = place.get("crm:P1_is_identified_by")
-                if not isinstance(identified_by, list):
-                    identified_by = [identified_by]
+                identified_by = as_list(place.get("crm:P1_is_identified_by"))
+                if not identified_by:
+                    continue
 
                 label_container = identified_by[0].get("crm:P87_is_identified_by")
                 if isinstance(label_container, dict):
@@ -232,10 +420,8 @@ def create_intermediate_representation_agorha(data):
         return "Not Specified"
 
     def extract_creator(data):
-        produced = data["crm:P108i_was_produced_by"]
+        produced = as_list(data.get("crm:P108i_was_produced_by"))
         if produced:
-            if not isinstance(produced,list):
-                produced = [produced]
             author = produced[0].get("crm:P14_carried_out_by")
             if author:
                 author = author.get("rdfs:label")
@@ -244,13 +430,9 @@ def create_intermediate_representation_agorha(data):
         return "Not Specified"
 
     def extract_dimensions(data):
-        dimensions_raw = data.get("crm:P43_has_dimension", [])
-        if not isinstance(dimensions_raw, list):
-            dimensions_raw = [dimensions_raw]
-
         dimension_list = []
 
-        for i, dim in enumerate(dimensions_raw):
+        for dim in as_list(data.get("crm:P43_has_dimension")):
             value = dim.get("crm:P90_has_value")
             if not value:
                 continue
@@ -284,10 +466,7 @@ def create_intermediate_representation_agorha(data):
         if not identified_by:
             return materials
 
-        if isinstance(identified_by, dict):
-            identified_by = [identified_by]
-
-        for material in identified_by:
+        for material in as_list(identified_by):
             label_data = material.get("rdfs:label", {})
 
             if isinstance(label_data, dict):
@@ -300,20 +479,17 @@ def create_intermediate_representation_agorha(data):
         return materials
 
     def extract_owner(data):
-        refered_to_by = data.get("crm:P67i_is_referred_to_by")
-        if refered_to_by:
-            if not isinstance(refered_to_by,list):
-                refered_to_by = [refered_to_by]
-            for item in refered_to_by:
-                current_owner = item.get("crm:P51_has_former_or_current_owner")
-                if current_owner:
-                    owner = current_owner["rdfs:label"]
-                    return owner
-                    
+        for item in as_list(data.get("crm:P67i_is_referred_to_by")):
+            current_owner = item.get("crm:P51_has_former_or_current_owner") if isinstance(item, dict) else None
+            if current_owner:
+                owner = current_owner["rdfs:label"]
+                return owner
+
         return "Not Specified"
 
     def extract_object_description(data):
-        for ref in data.get("crm:P67i_is_referred_to_by", []):
+        # Première description dans l'ordre de la notice : texte seul ou note
+        for ref in as_list(data.get("crm:P67i_is_referred_to_by")):
             if isinstance(ref, str):
                 return ref
             note = ref.get("crm:P3_has_note")
@@ -321,35 +497,23 @@ def create_intermediate_representation_agorha(data):
                 return note["@value"]
 
     def extract_collection(data):
-        if data.get("crm:P24i_changed_ownership_through"):
-            ownership_list = data["crm:P24i_changed_ownership_through"]
-
-            # Transformer en liste si besoin
-            if not isinstance(ownership_list,list):
-                ownership_list = [ownership_list]
-
-            for owner in ownership_list:
-                refers_to = owner.get("crm:P67_refers_to")
-                if refers_to:
-                    if isinstance(refers_to, list):
-                        refers_to = refers_to[0]
-                    return refers_to["rdfs:label"]
+        # Transformer en liste si besoin
+        for owner in as_list(data.get("crm:P24i_changed_ownership_through")):
+            refers_to = owner.get("crm:P67_refers_to")
+            if refers_to:
+                if isinstance(refers_to, list):
+                    refers_to = refers_to[0]
+                return refers_to["rdfs:label"]
 
         return "Not Specified"
 
     def extract_current_location(data):
-        permanent_location = data.get("crm:P54_has_current_permanent_location")
+        permanent_location = as_list(data.get("crm:P54_has_current_permanent_location"))
         if permanent_location:
             # Transformer en liste si besoin
-            if not isinstance(permanent_location, list):
-                permanent_location = [permanent_location]
-            
-            # Transformer en liste si besoin
-            id_by = permanent_location[0].get("crm:P87_is_identified_by")
-            if not isinstance(id_by, list):
-                id_by = [id_by]
-            
-            value = id_by[0].get("crm:P1_is_identified_by")
+            id_by = as_list(permanent_location[0].get("crm:P87_is_identified_by"))
+
+            value = id_by[0].get("crm:P1_is_identified_by") if id_by else None
             if value:
                 value = value["crm:P87_is_identified_by"]["rdfs:label"]
                 return value
@@ -360,10 +524,12 @@ def create_intermediate_representation_agorha(data):
         changed_ownership = data.get("crm:P24i_changed_ownership_through")
         if changed_ownership:
             if isinstance(changed_ownership, list) and len(changed_ownership) >= 3 and changed_ownership[2].get("crm:P67_refers_to"):
-                return data["crm:P24i_changed_ownership_through"][2]["crm:P67_refers_to"]["rdfs:label"]
+                return changed_ownership[2]["crm:P67_refers_to"]["rdfs:label"]
 
         return "Not Specified"
 
+    # Forme unique quel que soit le contexte JSON-LD de la notice (voir framing.py)
+    data = frame_notice(data)
 
     dimension_list = extract_dimensions(data)
 
@@ -375,41 +541,46 @@ def create_intermediate_representation_agorha(data):
     lenght_unit = dimension_list[1]['unit'] if len(dimension_list) > 1 else "Not Specified"
     width_unit = dimension_list[2]['unit'] if len(dimension_list) > 2 else "Not Specified"
 
-    struct = {
-        "data_source": "agorha",
-        "id": data['@id'],
-        "title": data.get("crm:P102_has_title")["rdfs:label"]["@value"] 
+    return IntermediateRecord(
+        data_source="agorha",
+        id=data['@id'],
+        title=data.get("crm:P102_has_title")["rdfs:label"]["@value"]
         if not isinstance(data.get('crm:P102_has_title'), list)
         else data.get("crm:P102_has_title")[0]["rdfs:label"]["@value"],
-        "inventory_number": get_inventory_number(data),
-        "timespan": extract_timespan(data),
-        "place_of_creation": extract_place_of_creation(data),
-        "creator": extract_creator(data),
-        "collection": extract_collection(data),
-        "width":width,
-        "height":height,
-        "length":lenght,
-        "width_unit":width_unit,
-        "height_unit":height_unit,
-        "length_unit": lenght_unit,
-        "materials": extract_materials(data),
-        "object_description": extract_object_description(data),
-        "owner": extract_owner(data),
-        "current_permanent_custodian": "Not Specified",
-        "current_custodian": "Not Specified",
-        "current_location": extract_current_location(data),
-        "changed_ownership_through": {
-            "mode_of_transfer": extract_mode_of_transfer(data),
-            "timespan_beginning": "xxxx",
-            "timespan_end": "xxxx",
-            "previous_owner":"Not Specified"
-        } if data.get('crm:P24i_changed_ownership_through') else None,
-        "exhibition": "Not Specified",
-    }
-
-    return struct
+        inventory_number=get_inventory_number(data),
+        timespan=extract_timespan(data),
+        place_of_creation=extract_place_of_creation(data),
+        creator=extract_creator(data),
+        collection=extract_collection(data),
+        width=width,
+        height=height,
+        length=lenght,
+        width_unit=width_unit,
+        height_unit=height_unit,
+        length_unit=lenght_unit,
+        materials=extract_materials(data),
+        object_description=extract_object_description(data),
+        owner=extract_owner(data),
+        current_permanent_custodian="Not Specified",
+        current_custodian="Not Specified",
+        current_location=extract_current_location(data),
+        changed_ownership_through=Acquisition(
+            mode_of_transfer=extract_mode_of_transfer(data),
+            timespan_beginning="xxxx",
+            timespan_end="xxxx",
+            previous_owner="Not Specified",
+        ) if data.get('crm:P24i_changed_ownership_through') else None,
+        exhibition="Not Specified",
+    )
 
 def create_intermediate_representation_paris_musees(data):
+    def dimension_unit(index):
+        dimensions = data.get("fieldOeuvreDimensions") or []
+        if len(dimensions) > index and dimensions[index] and dimensions[index].get("entity"):
+            unit = dimensions[index]["entity"].get("fieldDimensionUnite") or {}
+            return (unit.get("entity") or {}).get("entityLabel", "centimeters")
+        return "Not Specified"
+
     # Default Case
     materials_list = ["Not Specified"]
     if data.get("queryFieldMateriauxTechnique"):
@@ -417,87 +588,84 @@ def create_intermediate_representation_paris_musees(data):
         materials_list = filter(lambda e: e.get('entityLabel'), materials_list)
         materials_list = map(lambda e: e.get('entityLabel'), materials_list)
 
-    struct = {
-        "data_source": "paris_musees",
-        "id": data["absolutePath"],
-        "title": data["title"],
-        "inventory_number": data.get("fieldOeuvreNumInventaire") if data.get("fieldOeuvreNumInventaire") else None,
-        "timespan": {
-            "creation_date": data.get("fieldOeuvreSiecle", {}).get("entity", {}).get("entityLabel") if isinstance(data.get("fieldOeuvreSiecle"), dict) else None,
-            "beginning": str(data.get("fieldDateProduction", {}).get("startYear")) if isinstance(data.get("fieldDateProduction"), dict) else None,
-            "end": str(data.get("fieldDateProduction", {}).get("endYear")) if isinstance(data.get("fieldDateProduction"), dict) else None
-        },
-        "place_of_creation": "Chine",
-        "creator": data.get("fieldAuteurAuteur")["entity"]["entityLabel"] if data.get("fieldAuteurAuteur") and len( data["fieldAuteurAuteur"]) > 0 else "Not Specified",
-        "collection": "Not Specified",
-        "width":data.get("fieldOeuvreDimensions")[1]["entity"]["fieldDimensionValeur"]  if data.get("fieldOeuvreDimensions") and len( data["fieldOeuvreDimensions"]) > 1 else None,
-        "height":data.get("fieldOeuvreDimensions")[0]["entity"]["fieldDimensionValeur"] if data.get("fieldOeuvreDimensions") and len( data["fieldOeuvreDimensions"]) > 0 else None,
-        "length":data.get("fieldOeuvreDimensions")[2]["entity"]["fieldDimensionValeur"] if data.get("fieldOeuvreDimensions") and len( data["fieldOeuvreDimensions"]) > 2 else None,
-        "width_unit":"centimeters",
-        "height_unit":"centimeters",
-        "length_unit": "centimeters",
-        "materials": materials_list,
-        "object_description": data.get("fieldOeuvreDescriptionIcono")["value"] if data.get("fieldOeuvreDescriptionIcono") else None,
-        "owner": "Not Specified",
-        "current_permanent_custodian": "Not Specified",
-        "current_custodian": "Not Specified",
-        "current_location": data.get("queryFieldMusee")["entities"][0]["entityLabel"],
-        "changed_ownership_through": {
-            "mode_of_transfer": data.get("queryFieldModaliteAcquisition", {}).get("entities", [{}])[0].get("entityLabel", "Not Specified"),
-            "timespan_beginning": "xxxx",
-            "timespan_end": "xxxx",
-            "previous_owner": data.get("queryFieldDonateurs", {}).get("entities", [{}])[0].get("entityLabel", "Not Specified"),
-        } if data.get('queryFieldDonateurs') else None,
-        "exhibition": "Not Specified",
-    }
-
-    return struct
+    return IntermediateRecord(
+        data_source="paris_musees",
+        id=data["absolutePath"],
+        title=data["title"],
+        inventory_number=data.get("fieldOeuvreNumInventaire") if data.get("fieldOeuvreNumInventaire") else None,
+        timespan=TimeSpan(
+            creation_date=data.get("fieldOeuvreSiecle", {}).get("entity", {}).get("entityLabel") if isinstance(data.get("fieldOeuvreSiecle"), dict) else None,
+            beginning=str(data.get("fieldDateProduction", {}).get("startYear")) if isinstance(data.get("fieldDateProduction"), dict) else None,
+            end=str(data.get("fieldDateProduction", {}).get("endYear")) if isinstance(data.get("fieldDateProduction"), dict) else None,
+        ),
+        place_of_creation="Chine",
+        creator=data.get("fieldAuteurAuteur")["entity"]["entityLabel"] if data.get("fieldAuteurAuteur") and len( data["fieldAuteurAuteur"]) > 0 else "Not Specified",
+        collection="Not Specified",
+        width=data.get("fieldOeuvreDimensions")[1]["entity"]["fieldDimensionValeur"]  if data.get("fieldOeuvreDimensions") and len( data["fieldOeuvreDimensions"]) > 1 else None,
+        height=data.get("fieldOeuvreDimensions")[0]["entity"]["fieldDimensionValeur"] if data.get("fieldOeuvreDimensions") and len( data["fieldOeuvreDimensions"]) > 0 else None,
+        length=data.get("fieldOeuvreDimensions")[2]["entity"]["fieldDimensionValeur"] if data.get("fieldOeuvreDimensions") and len( data["fieldOeuvreDimensions"]) > 2 else None,
+        width_unit=dimension_unit(1),
+        height_unit=dimension_unit(0),
+        length_unit=dimension_unit(2),
+        materials=list(materials_list),
+        object_description=data.get("fieldOeuvreDescriptionIcono")["value"] if data.get("fieldOeuvreDescriptionIcono") else None,
+        owner="Not Specified",
+        current_permanent_custodian="Not Specified",
+        current_custodian="Not Specified",
+        current_location=data.get("queryFieldMusee")["entities"][0]["entityLabel"],
+        changed_ownership_through=Acquisition(
+            mode_of_transfer=data.get("queryFieldModaliteAcquisition", {}).get("entities", [{}])[0].get("entityLabel", "Not Specified"),
+            timespan_beginning="xxxx",
+            timespan_end="xxxx",
+            previous_owner=data.get("queryFieldDonateurs", {}).get("entities", [{}])[0].get("entityLabel", "Not Specified"),
+        ) if data.get('queryFieldDonateurs') else None,
+        exhibition="Not Specified",
+    )
 
 def create_intermediate_representation_louvre(data):
-    struct = {
-        "data_source": "louvre",
-        "id": data["url"],
-        "title": data["title"],
-        "inventory_number": data.get("objectNumber")[0]["value"] if data.get("objectNumber") else None,
-        "timespan": {
-            "creation_date": data.get("dateCreated")[0]["text"] if data.get("dateCreated") else None,
-            "beginning": str(data.get("dateCreated")[0]["startYear"]) if data.get( "dateCreated") else None,
-            "end": str(data.get("dateCreated")[0]["endYear"]) if data.get("dateCreated") else None,
-        },
-        "place_of_creation": data['placeOfCreation'],
-        "creator": data.get("creator")[0]["label"] if data.get("creator") and len( data["creator"]) > 0 else "Not Specified",
-        "collection": data['collection'],
-        "width":data.get("dimension")[0]["displayDimension"] if data.get("dimension") and len( data["dimension"]) > 0 else None,
-        "height":data.get("dimension")[1]["displayDimension"] if data.get("dimension") and len( data["dimension"]) > 1 else None,
-        "length":data.get("dimension")[2]["displayDimension"] if data.get("dimension") and len( data["dimension"]) > 2 else None,
-        "width_unit":"centimeters",
-        "height_unit":"centimeters",
-        "length_unit": "centimeters",
-        "materials": [
-            data['materialsAndTechniques']
-        ],
-        'object_description': data['description'],
-        "owner": data['ownedBy'],
-        "current_permanent_custodian": data['heldBy'],
-        "current_custodian": data['longTermLoanTo'],
-        "current_location": data['currentLocation'],
-        "changed_ownership_through": {
-            "mode_of_transfer": data.get("acquisitionDetails")[0]['mode'] if data.get("acquisitionDetails") else "Not Specified",
-            "timespan_beginning": str(data.get("acquisitionDetails")[0]["dates"][0]["startYear"]) if data.get( "acquisitionDetails") and (len(data.get("acquisitionDetails")[0]["dates"]) != 0) else "xxxx",
-            "timespan_end": str(data.get("acquisitionDetails")[0]["dates"][0]["endYear"]) if data.get( "acquisitionDetails") and (len(data.get("acquisitionDetails")[0]["dates"]) != 0) else "xxxx",
-            "previous_owner": data["previousOwner"][0]["value"] if data.get("previousOwner") and len( data["previousOwner"]) > 0 else "Not Specified",
-        } if len(data['acquisitionDetails']) != 0 else None,
-        "exhibition": data.get("exhibition")[0]["value"] if data.get("exhibition") and len(data["exhibition"]) > 0 else None,
-    }
-
-    return struct
+    return IntermediateRecord(
+        data_source="louvre",
+        id=data["url"],
+        title=data["title"],
+        inventory_number=data.get("objectNumber")[0]["value"] if data.get("objectNumber") else None,
+        timespan=TimeSpan(
+            creation_date=data.get("dateCreated")[0]["text"] if data.get("dateCreated") else None,
+            beginning=str(data.get("dateCreated")[0]["startYear"]) if data.get( "dateCreated") else None,
+            end=str(data.get("dateCreated")[0]["endYear"]) if data.get("dateCreated") else None,
+        ),
+        place_of_creation=data['placeOfCreation'],
+        creator=data.get("creator")[0]["label"] if data.get("creator") and len( data["creator"]) > 0 else "Not Specified",
+        collection=data['collection'],
+        width=data.get("dimension")[0]["displayDimension"] if data.get("dimension") and len( data["dimension"]) > 0 else None,
+        height=data.get("dimension")[1]["displayDimension"] if data.get("dimension") and len( data["dimension"]) > 1 else None,
+        length=data.get("dimension")[2]["displayDimension"] if data.get("dimension") and len( data["dimension"]) > 2 else None,
+        width_unit="centimeters",
+        height_unit="centimeters",
+        length_unit="centimeters",
+        materials=louvre_materials(data['materialsAndTechniques']),
+        object_description=data['description'],
+        owner=data['ownedBy'],
+        current_permanent_custodian=data['heldBy'],
+        current_custodian=data['longTermLoanTo'],
+        current_location=data['currentLocation'],
+        changed_ownership_through=Acquisition(
+            mode_of_transfer=data.get("acquisitionDetails")[0]['mode'] if data.get("acquisitionDetails") else "Not Specified",
+            timespan_beginning=str(data.get("acquisitionDetails")[0]["dates"][0]["startYear"]) if data.get( "acquisitionDetails") and (len(data.get("acquisitionDetails")[0]["dates"]) != 0) else "xxxx",
+            timespan_end=str(data.get("acquisitionDetails")[0]["dates"][0]["endYear"]) if data.get( "acquisitionDetails") and (len(data.get("acquisitionDetails")[0]["dates"]) != 0) else "xxxx",
+            previous_owner=data["previousOwner"][0]["value"] if data.get("previousOwner") and len( data["previousOwner"]) > 0 else "Not Specified",
+        ) if len(data['acquisitionDetails']) != 0 else None,
+        exhibition=data.get("exhibition")[0]["value"] if data.get("exhibition") and len(data["exhibition"]) > 0 else None,
+    )
 
 def intermediate_represantation_to_linkedart(intermediate):
+    def resolve_unit(unit):
+        return uri_searcher(unit, "unit", intermediate.data_source)
+
     result = {
         "@context": "https://linked.art/ns/v1/linked-art.json",
-        "id": intermediate['id'],
+        "id": intermediate.id,
         "type": "HumanMadeObject",
-        "_label": intermediate['title'],
+        "_label": intermediate.title,
         # "identified_by" : Titre, numéro d'inventaire et typologie de l'oeuvre
         "identified_by": [
             {
@@ -514,7 +682,7 @@ def intermediate_represantation_to_linkedart(intermediate):
                         "_label": "Primary Name"
                     }
                 ],
-                "content": intermediate['title'],
+                "content": intermediate.title,
                 "language": [
                     {
                         "id": "http://vocab.getty.edu/page/aat/300388306",
@@ -533,7 +701,7 @@ def intermediate_represantation_to_linkedart(intermediate):
                         "_label": "Accession Number"
                     }
                 ],
-                "content": intermediate['inventory_number']
+                "content": intermediate.inventory_number
             }],
         # "produced_by" : Date, lieu de création et auteur
         "produced_by": [
@@ -541,21 +709,22 @@ def intermediate_represantation_to_linkedart(intermediate):
                 "type": "Production",
                 "timespan": {
                     "type": "TimeSpan",
-                    "_label": intermediate['timespan']['creation_date'],
-                    "begin_of_the_begin": intermediate['timespan']['beginning'],
-                    "end_of_the_end": intermediate['timespan']['end'],
+                    "_label": intermediate.timespan.creation_date,
+                    "begin_of_the_begin": intermediate.timespan.beginning,
+                    "end_of_the_end": intermediate.timespan.end,
                 },
                 "took_place_at": [
                     {
                         "id": "https://vocab.getty.edu/tgn/1000111",
                         "type": "Place",
-                        "_label": intermediate['place_of_creation']
+                        "_label": intermediate.place_of_creation
                     }
                 ],
                 "carried_out_by": [
                     {
-                        "id": uri_searcher(intermediate['creator'], "carried_out_by", intermediate['data_source']),
-                        "_label": intermediate['creator'],
+                        "id": uri_searcher(intermediate.creator, "carried_out_by", intermediate.data_source),
+                        "type": "Group",
+                        "_label": intermediate.creator,
                     }
                 ]
             }
@@ -563,41 +732,41 @@ def intermediate_represantation_to_linkedart(intermediate):
         # "member_of": collection et exposition
         "member_of": [
             {
-                "id": uri_searcher(intermediate['collection'], "member_of", intermediate['data_source']),
+                "id": uri_searcher(intermediate.collection, "member_of", intermediate.data_source),
                 "type": "Set",
-                "_label": intermediate['collection'],
+                "_label": intermediate.collection,
             },
         ],
         # "made_of" : Matériaux
         "made_of": [
             {
-                "id": uri_searcher(material, "made_of", intermediate['data_source']),
+                "id": uri_searcher(material, "made_of", intermediate.data_source),
                 "type": "Material",
                 "_label": material
-            } for material in intermediate['materials']
+            } for material in intermediate.materials
         ],
         # "dimension" : dimensions longueur, hauteur, largeur
         "dimension": [
             {
                 "type": "Dimension",
                 "classified_as": [{"id": "http://vocab.getty.edu/aat/300055647", "type": "Type", "_label": "Width"}],
-                "value": intermediate['width'],
-                "unit": {"id": uri_searcher(intermediate['width_unit'], "unit", intermediate['data_source']), "type": "MeasurementUnit",
-                         "_label": intermediate['width_unit']}
+                "value": intermediate.width,
+                "unit": {"id": unit_uri(intermediate.width_unit, resolve_unit), "type": "MeasurementUnit",
+                         "_label": intermediate.width_unit}
             },
             {
                 "type": "Dimension",
                 "classified_as": [{"id": "http://vocab.getty.edu/aat/300055644", "type": "Type", "_label": "Height"}],
-                "value": intermediate['height'],
-                "unit": {"id": uri_searcher(intermediate['height_unit'], "unit", intermediate['data_source']), "type": "MeasurementUnit",
-                         "_label": intermediate['height_unit']}
+                "value": intermediate.height,
+                "unit": {"id": unit_uri(intermediate.height_unit, resolve_unit), "type": "MeasurementUnit",
+                         "_label": intermediate.height_unit}
             },
             {
                 "type": "Dimension",
                 "classified_as": [{"id": "http://vocab.getty.edu/aat/300055644", "type": "Type", "_label": "Length"}],
-                "value": intermediate['length'],
-                "unit": {"id": uri_searcher(intermediate['length_unit'], "unit", intermediate['data_source']), "type": "MeasurementUnit",
-                         "_label": intermediate['length_unit']}
+                "value": intermediate.length,
+                "unit": {"id": unit_uri(intermediate.length_unit, resolve_unit), "type": "MeasurementUnit",
+                         "_label": intermediate.length_unit}
             }
         ],
         # "referred_to_by" : commentaire
@@ -618,39 +787,39 @@ def intermediate_represantation_to_linkedart(intermediate):
                         ]
                     }
                 ],
-                "content": intermediate['object_description']
+                "content": intermediate.object_description
             }
         ],
         # "current_owner" : propriétaire
         "current_owner": [
             {
-                "id": uri_searcher(intermediate['owner'], "current_owner", intermediate['data_source']),
+                "id": uri_searcher(intermediate.owner, "current_owner", intermediate.data_source),
                 "type": "Group",
-                "_label": intermediate['owner']
+                "_label": intermediate.owner
             }
         ],
         # "current_permanent_custodian": affectataire
         "current_permanent_custodian": {
-            "id": uri_searcher(intermediate["current_permanent_custodian"], "current_permanent_custodian", intermediate['data_source']),
+            "id": uri_searcher(intermediate.current_permanent_custodian, "current_permanent_custodian", intermediate.data_source),
             "type": "Group",
-            "_label": intermediate["current_permanent_custodian"],
+            "_label": intermediate.current_permanent_custodian,
         },
 
         # "current_custodian" : dépositaire 
         "current_custodian": [
             {
-                "id": uri_searcher(intermediate["current_custodian"], "current_custodian", intermediate['data_source']),
+                "id": uri_searcher(intermediate.current_custodian, "current_custodian", intermediate.data_source),
                 "type": "Group",
-                "_label": intermediate["current_custodian"],
+                "_label": intermediate.current_custodian,
             }
         ],
 
         # "current_location" : Emplacement actuel
         "current_location": [
             {
-                "id": uri_searcher(intermediate['current_location'], "current_location", intermediate['data_source']),
+                "id": uri_searcher(intermediate.current_location, "current_location", intermediate.data_source),
                 "type": "Place",
-                "_label": intermediate['current_location'],
+                "_label": intermediate.current_location,
             }
         ],
     }
@@ -658,105 +827,454 @@ def intermediate_represantation_to_linkedart(intermediate):
     # CAS PARTICULIERS
     # Traitement pour le Louvre
     #-------------------------------------------
-    if intermediate['changed_ownership_through']:
+    if intermediate.changed_ownership_through:
         result['changed_ownership_through'] = [
                 {
-                    "type": "Acquisiton",
-                    "_label": intermediate['changed_ownership_through']['mode_of_transfer'],
+                    "type": "Acquisition",
+                    "_label": intermediate.changed_ownership_through.mode_of_transfer,
                     "timespan": {
                         "type": "TimeSpan",
-                        "begin_of_the_begin": intermediate['changed_ownership_through']['timespan_beginning'],
-                        "end_of_the_end": intermediate['changed_ownership_through']['timespan_end'],
+                        "begin_of_the_begin": intermediate.changed_ownership_through.timespan_beginning,
+                        "end_of_the_end": intermediate.changed_ownership_through.timespan_end,
                     },
                     "transferred_title_from": [
                         {
-                            "id": uri_searcher(intermediate['changed_ownership_through']['previous_owner'], "transferred_title_from", intermediate['data_source']),
-                            "_label": intermediate['changed_ownership_through']['previous_owner']
+                            "id": uri_searcher(intermediate.changed_ownership_through.previous_owner, "transferred_title_from", intermediate.data_source),
+                            "type": "Group",
+                            "_label": intermediate.changed_ownership_through.previous_owner
                         }
                     ]
                 }
         ]
     
-    if intermediate['exhibition']:
+    if intermediate.exhibition:
         result['member_of'].append({
-                "id": uri_searcher(intermediate['exhibition'], "exhibition", intermediate['data_source']),
+                "id": uri_searcher(intermediate.exhibition, "exhibition", intermediate.data_source),
                 "type": "Set",
-                "_label": intermediate['exhibition']
+                "_label": intermediate.exhibition
         })
 
     #-------------------------------------------
 
     return result
 
-# Pipeline
-def process_directory(input_dir, normalizer, prefix):
-    output_dir = "output"
-    os.makedirs(output_dir, exist_ok=True)
-    for f in os.listdir(input_dir):
-        # Obtenir chaque fichier JSON
-        if f.endswith(".json") or f.endswith(".jsonld"):
-            if f.endswith(".json"):
-                extension = ".json"
-            if f.endswith(".jsonld"):
-                extension = ".jsonld"
-
-            with open(os.path.join(input_dir, f), "r", encoding="utf-8") as infile:
-                data = json.load(infile)
-
-            # Normaliser
-            intermediate = normalizer(data)
-
-            # Transformer en Linkedart
-            result = intermediate_represantation_to_linkedart(intermediate)
-
-            # Sauvgarder l'output
-            out_path = os.path.join(output_dir, f.replace(extension, f"_{prefix}_linkedart.jsonld"))
-            with open(out_path, "w", encoding="utf-8") as outfile:
-                json.dump(result, outfile, indent=2, ensure_ascii=False)
+# --- Registre des normaliseurs
+
+# Source -> normaliseur vers la représentation intermédiaire
+NORMALIZERS = {
+    "agorha": create_intermediate_representation_agorha,
+    "paris_musees": create_intermediate_representation_paris_musees,
+    "louvre": create_intermediate_representation_louvre,
+}
+
+# Clés caractéristiques de chaque format, testées dans l'ordre (quelques tests d'appartenance par notice)
+SOURCE_KEYS = [
+    ("agorha", ("crm:P102_has_title", "crm:P108i_was_produced_by", "crm:P54_has_current_permanent_location", "crm:P43_has_dimension")),
+    ("paris_musees", ("entityUuid", "absolutePath")),
+    ("louvre", ("objectNumber", "url")),
+]
+
+def register_normalizer(source, normalizer, keys=()):
+    NORMALIZERS[source] = normalizer
+    if keys:
+        SOURCE_KEYS.append((source, tuple(keys)))
+
+def detect_source(data):
+    # Reconnaît le format d'une notice à la forme du document ; None si inconnu
+    if not isinstance(data, dict):
+        return None
+    for source, keys in SOURCE_KEYS:
+        for key in keys:
+            if key in data:
+                return source
+    # Notice Agorha sans les propriétés habituelles, ou non compactée (@graph, IRI complètes)
+    if "@graph" in data or "@context" in data or any(key.startswith("crm:") or "cidoc-crm" in key for key in data):
+        return "agorha"
+    return None
+
+def normalizer_for(data):
+    source = detect_source(data)
+    if source is None:
+        raise ValueError("format de notice non reconnu")
+    return source, NORMALIZERS[source]
 
-# --- Version Mulithreading
+# Pipeline
+@dataclass(slots=True)
+class FileTask:
+    # Un fichier d'entrée et son état au fil des étapes du pipeline
+    # (normalizer et prefix à None : source détectée à la lecture de la notice)
+    name: str
+    extension: str
+    input_dir: str
+    normalizer: object | None
+    prefix: str | None
+    output_dir: str
+    corpus: Corpus | None = None
+    entry: dict | None = None
+    text: str | None = None
+    intermediate: IntermediateRecord | None = None
+    result: dict | None = None
+    # Notice déjà décodée (lue depuis un export GraphQL plutôt qu'un fichier par notice)
+    data: dict | None = None
+    # Lecture différée d'un membre d'archive zip (décompressé à l'étape de lecture)
+    load: object | None = None
+    # Entrée d'où vient la notice (dossier, archive, export) : clé du journal de reprise avec le nom
+    origin: str | None = None
+    # Ligne du corpus, gardée pour le journal de reprise
+    row: list | None = None
+
+def read_stage(task):
+    if task.data is not None or task.text is not None:
+        return task
+    if task.load is not None:
+        task.text, task.load = task.load(), None
+        return task
+    with open(os.path.join(task.input_dir, task.name), "r", encoding="utf-8") as infile:
+        task.text = infile.read()
+    return task
+
+def json_load_stage(task):
+    # Décodage JSON, chronométré à part de la normalisation
+    if task.data is None:
+        task.data = json.loads(task.text)
+    task.text = None
+    return task
+
+def normalize_stage(task):
+    data, task.data = task.data, None
+    if task.normalizer is None:
+        task.prefix, task.normalizer = normalizer_for(data)
+        if task.entry is not None:
+            task.entry["source"] = task.prefix
+    task.intermediate = task.normalizer(data)
+    normalize_dimensions(task.intermediate)
+    normalize_timespans(task.intermediate)
+    return task
+
+def resolve_stage(task):
+    # Transformer en Linkedart (recherches de vocabulaire)
+    task.result = intermediate_represantation_to_linkedart(task.intermediate)
+    return task
+
+def crosswalk_stage(task):
+    if CROSSWALK:
+        apply_crosswalk(task.result, crosswalk, LOOKUP_TIMEOUT)
+    return task
+
+def validate(result):
+    for path, message in validate_linked_art(result):
+        note_violation(path, message)
+
+def validate_stage(task):
+    if VALIDATE:
+        validate(task.result)
+    return task
+
+def share_stage(task):
+    if SHARED_NODES is not None:
+        SHARED_NODES.extract(task.result)
+    return task
+
+def serialize_stage(task):
+    # Conserver la représentation intermédiaire pour les statistiques
+    if task.corpus is not None:
+        task.row = task.corpus.append(task.intermediate, task.result)
+    task.text = json.dumps(task.result, indent=2, ensure_ascii=False)
+    task.intermediate = task.result = None
+    return task
+
+def write_stage(task):
+    # Fichier temporaire puis renommage : jamais de notice à moitié écrite en cas d'arrêt
+    # (synchronisé sur disque avant d'être journalisé si --checkpoint)
+    out_path = os.path.join(task.output_dir, task.name.replace(task.extension, f"_{task.prefix}_linkedart.jsonld"))
+    write_file(out_path, task.text, sync=CHECKPOINT is not None)
+    task.text = None
+    return task
+
+def checkpoint_task(task):
+    # Notice écrite et entrée du rapport close : journalisée avec ses sorties annexes
+    if CHECKPOINT is not None:
+        CHECKPOINT.record(task.origin, task.name, task.entry, task.row)
+    task.row = None
+
+TRANSFORM_STAGES = (
+    ("read", read_stage),
+    ("json_load", json_load_stage),
+    ("normalize", normalize_stage),
+    ("resolve", resolve_stage),
+    ("crosswalk", crosswalk_stage),
+    ("validate", validate_stage),
+    ("share", share_stage),
+    ("serialize", serialize_stage),
+    ("write", write_stage),
+)
+
+def prefetch_crosswalk():
+    # QID connus avant la première notice (cas particuliers, cache de vocabulaire) : traduits par lots
+    uris = [uri for cases in SPECIAL_CASES.values() for table in cases.values() for uri in table.values()]
+    qids = sorted({q for q in map(qid, uris + vocabulary_cache.uris()) if q})
+    crosswalk.prefetch(qids, LOOKUP_TIMEOUT)
+
+def transform_notice(data, normalizer):
+    # Une notice déjà chargée -> Linked Art (utilisé par le mode serveur)
+    with metrics.stage("normalize"):
+        intermediate = normalizer(data)
+        normalize_dimensions(intermediate)
+        normalize_timespans(intermediate)
+    with metrics.stage("resolve"):
+        result = intermediate_represantation_to_linkedart(intermediate)
+    if CROSSWALK:
+        with metrics.stage("crosswalk"):
+            apply_crosswalk(result, crosswalk, LOOKUP_TIMEOUT)
+    if VALIDATE:
+        with metrics.stage("validate"):
+            validate(result)
+    return result
 
-def process_file_mulithread(f, input_dir, normalizer, prefix, output_dir):
+def file_extension(f):
     if f.endswith(".json"):
-        extension = ".json"
-    elif f.endswith(".jsonld"):
-        extension = ".jsonld"
-    else:
-        return
-
-    try:
-        with open(os.path.join(input_dir, f), "r", encoding="utf-8") as infile:
-            data = json.load(infile)
+        return ".json"
+    if f.endswith(".jsonld"):
+        return ".jsonld"
+    return None
+
+def run_stages(task):
+    for name, function in TRANSFORM_STAGES:
+        with metrics.stage(name):
+            function(task)
+
+def transform_task(task, report=None):
+    # Version séquentielle : une notice de bout en bout
+    with track_file(report, task.name, task.prefix or "unknown") as entry:
+        task.entry = entry
+        run_stages(task)
+    checkpoint_task(task)
+
+def archive_tasks(path, normalizer, prefix, output_dir, corpus=None):
+    # Membres .json/.jsonld d'une archive ; le fichier de sortie porte le chemin du membre aplati (voir archives.py)
+    seen = set()
+    for member, content in iter_members(path):
+        name = member_name(member)
+        extension = file_extension(name)
+        if not extension:
+            continue
+        # Même nom de sortie et même clé de journal : la seconde notice écraserait la première
+        if name in seen:
+            raise ValueError(f"{path}: plusieurs membres donnent le fichier {name}")
+        seen.add(name)
+        if callable(content):
+            yield FileTask(name, extension, None, normalizer, prefix, output_dir, corpus, load=content, origin=path)
+        else:
+            yield FileTask(name, extension, None, normalizer, prefix, output_dir, corpus, text=content, origin=path)
 
-        # Normaliser l'input
-        intermediate = normalizer(data)
+def selected(task, shard):
+    # Notice de ce shard, pas encore terminée lors d'une exécution précédente
+    return in_shard(task.name, shard) and (CHECKPOINT is None or not CHECKPOINT.done(task.origin, task.name))
 
-        # Transformer en Linkedart
-        result = intermediate_represantation_to_linkedart(intermediate)
+def process_directory(input_dir, normalizer=None, prefix=None, corpus=None, report=None, output_dir="output", shard=None):
+    # shard : (i, N), seules les notices de la part i sont traitées (voir shards.py)
+    os.makedirs(output_dir, exist_ok=True)
+    if is_archive(input_dir):
+        for task in archive_tasks(input_dir, normalizer, prefix, output_dir, corpus):
+            if selected(task, shard):
+                transform_task(task, report)
+        return
+    for f in os.listdir(input_dir):
+        # Obtenir chaque fichier JSON
+        extension = file_extension(f)
+        if extension:
+            task = FileTask(f, extension, input_dir, normalizer, prefix, output_dir, corpus, origin=input_dir)
+            if selected(task, shard):
+                transform_task(task, report)
 
-        # Sauvgarder l'output
-        out_path = os.path.join(output_dir, f.replace(extension, f"_{prefix}_linkedart.jsonld"))
-        with open(out_path, "w", encoding="utf-8") as outfile:
-            json.dump(result, outfile, indent=2, ensure_ascii=False)
-    except Exception as e:
-        print(f"❌ Error processing {f}: {e}")
+# --- Version Mulithreading
 
-def process_directory_mulithread(input_dir, normalizer, prefix, num_threads=8):
-    output_dir = "output"
+# Nombre de workers par étape : les recherches distantes dominent, les étapes CPU restent légères
+DEFAULT_STAGE_WORKERS = {"read": 2, "json_load": 2, "normalize": 2, "resolve": 8, "crosswalk": 4, "validate": 2, "share": 1, "serialize": 1, "write": 2}
+
+def run_file_tasks(tasks, stage_workers=None, queue_size=64, report=None):
+    workers = dict(DEFAULT_STAGE_WORKERS)
+    workers.update(stage_workers or {})
+
+    first_stage = TRANSFORM_STAGES[0][0]
+
+    def call(stage, task):
+        # Entrée ouverte quand la première étape prend la notice : l'attente dans la file
+        # d'entrée ne compte pas dans la latence, comparable à celle de la version séquentielle
+        if report is not None and stage.name == first_stage:
+            task.entry = open_entry(task.name, task.prefix or "unknown")
+        with metrics.stage(stage.name), bind_entry(task.entry):
+            return metrics.call(stage.function, task)
+
+    def on_error(stage, task, e):
+        print(f"❌ Error processing {task.name}: {e}")
+        if task.entry is not None:
+            close_entry(report, task.entry, e)
+
+    def write_and_close(task):
+        write_stage(task)
+        if task.entry is not None:
+            close_entry(report, task.entry)
+        checkpoint_task(task)
+
+    stages = [Stage(name, function, workers[name]) for name, function in TRANSFORM_STAGES[:-1]]
+    stages.append(Stage("write", write_and_close, workers["write"]))
+    StagedPipeline(stages, queue_size, on_error, call).run(tasks)
+
+def interleave(iterables):
+    # Tourniquet entre plusieurs flux : aucun dossier n'attend la fin d'un autre
+    iterators = [iter(iterable) for iterable in iterables]
+    while iterators:
+        for iterator in list(iterators):
+            try:
+                yield next(iterator)
+            except StopIteration:
+                iterators.remove(iterator)
+
+def directory_tasks(input_dir, normalizer, prefix, output_dir, corpus=None):
+    # Parcours paresseux du dossier : les fichiers entrent dans le pipeline au fil de l'eau
+    for entry in os.scandir(input_dir):
+        extension = file_extension(entry.name)
+        if extension:
+            yield FileTask(entry.name, extension, input_dir, normalizer, prefix, output_dir, corpus, origin=input_dir)
+
+def dump_tasks(path, output_dir, corpus=None):
+    # Export GraphQL Paris Musées (data.nodeQuery.entities) lu en flux : pas de fichier par notice
+    for entity in iter_entities(path):
+        uuid = entity.get("entityUuid")
+        if uuid:
+            yield FileTask(f"{uuid}.json", ".json", None, NORMALIZERS["paris_musees"], "paris_musees", output_dir, corpus, data=entity, origin=path)
+
+def louvre_export_tasks(path, output_dir, corpus=None):
+    # Export complet du Louvre lu en flux, filtré sur les objets liés à la Chine
+    for record in iter_china_objects(path):
+        ark = louvre_ark(record)
+        if ark:
+            yield FileTask(f"{ark}.json", ".json", None, NORMALIZERS["louvre"], "louvre", output_dir, corpus, data=record, origin=path)
+
+def export_source(path, size=1 << 16):
+    # Un export GraphQL Paris Musées se reconnaît à nodeQuery/entities en tête de fichier ;
+    # sinon, tableau d'objets de l'export Louvre
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(size)
+    return "paris_musees" if '"nodeQuery"' in head or '"entities"' in head else "louvre"
+
+def input_tasks(input_path, normalizer, prefix, output_dir, corpus=None):
+    if is_archive(input_path):
+        return archive_tasks(input_path, normalizer, prefix, output_dir, corpus)
+    if os.path.isfile(input_path):
+        if (prefix or export_source(input_path)) == "louvre":
+            return louvre_export_tasks(input_path, output_dir, corpus)
+        return dump_tasks(input_path, output_dir, corpus)
+    return directory_tasks(input_path, normalizer, prefix, output_dir, corpus)
+
+def process_directories(sources, num_threads=8, corpus=None, report=None, stage_workers=None, queue_size=64, output_dir="output", shard=None):
+    # sources : liste de (input_dir, normalizer, prefix), traitées en un seul flux
+    # avec un seul jeu de workers et le cache de vocabulaire partagé ;
+    # un dossier seul (ou normalizer à None) : source détectée notice par notice ;
+    # une archive (.zip, .tar.zst…) : notices lues sans extraction ;
+    # un autre fichier : export GraphQL Paris Musées ou export complet du Louvre, lu en flux ;
+    # shard : (i, N), seules les notices de la part i sont traitées (voir shards.py)
     os.makedirs(output_dir, exist_ok=True)
 
-    files = [f for f in os.listdir(input_dir) if f.endswith((".json", ".jsonld"))]
+    sources = [(source, None, None) if isinstance(source, str) else source for source in sources]
+    tasks = interleave(
+        input_tasks(input_path, normalizer, prefix, output_dir, corpus)
+        for input_path, normalizer, prefix in sources
+    )
+    if shard is not None or CHECKPOINT is not None:
+        tasks = (task for task in tasks if selected(task, shard))
+    run_file_tasks(tasks, {"resolve": num_threads, **(stage_workers or {})}, queue_size, report)
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
-        futures = [
-            executor.submit(process_file_mulithread, f, input_dir, normalizer, prefix, output_dir)
-            for f in files
-        ]
-        for future in concurrent.futures.as_completed(futures):
-            future.result()
+def process_directory_mulithread(input_dir, normalizer=None, prefix=None, num_threads=8, corpus=None, report=None, stage_workers=None, queue_size=64, output_dir="output", shard=None):
+    process_directories([(input_dir, normalizer, prefix)], num_threads, corpus, report, stage_workers, queue_size, output_dir, shard)
 
 # --- Init pour chaque dataset ---
+def main(argv=None):
+    global LOOKUP_TIMEOUT, HEDGED_LOOKUPS, HEDGE_PERCENTILE, CROSSWALK, SHARED_NODES, VALIDATE, CHECKPOINT
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Transformation des notices vers Linked Art")
+    parser.add_argument("--input", nargs="+", metavar="DOSSIER", help="dossiers ou archives (.zip, .tar, .tar.gz, .tar.zst) d'entrée, éventuellement mélangés : la source de chaque notice est détectée (défaut : input_agorha, input_louvre, input_paris_musees) ; un fichier .json est lu comme un export GraphQL Paris Musées ou comme l'export complet du Louvre (objets liés à la Chine seulement)")
+    parser.add_argument("--timeout", type=float, default=LOOKUP_TIMEOUT, metavar="SECONDES", help="délai maximal d'une requête SPARQL (défaut : %(default)s)")
+    parser.add_argument("--hedge", nargs="?", type=float, const=HEDGE_PERCENTILE, metavar="PERCENTILE", help="interroger Wikidata en parallèle si Getty n'a pas répondu après ce percentile de ses temps de réponse (défaut : %(const)s)")
+    parser.add_argument("--crosswalk", action="store_true", help="remplacer les URI Wikidata par l'URI Getty correspondante quand elle existe (requêtes groupées vers Wikidata)")
+    parser.add_argument("--validate", action="store_true", help="valider chaque objet contre un sous-ensemble du schéma Linked Art (validation.py, pas une conformité complète) ; les écarts sont écrits dans le rapport d'exécution")
+    parser.add_argument("--shared-nodes", action="store_true", help="écrire une seule fois les groupes, lieux, matériaux et types (output/shared), référencés par id dans les objets")
+    parser.add_argument("--shard", metavar="i/N", help="ne traiter que la part i (0 <= i < N) des notices, réparties par hachage de leur identifiant ; sorties, rapport et cache écrits dans output/shard-<i>-of-<N> (fusion : shards.py)")
+    parser.add_argument("--checkpoint", action="store_true", help="journaliser les notices terminées (output/checkpoint.jsonl) et reprendre là où une exécution interrompue s'est arrêtée, avec son cache de vocabulaire")
+    parser.add_argument("--vocab-cache", metavar="FICHIER", help="cache de vocabulaire persistant (rempli par prefetch.py ou une exécution précédente), relu au départ et enregistré à la fin")
+    parser.add_argument("--corpus", metavar="FICHIER", help="écrire aussi le corpus intermédiaire en colonnes (Parquet), ex. output/corpus.parquet")
+    parser.add_argument("--report", default="output/run_report.json", metavar="FICHIER", help="rapport d'exécution JSON (défaut : %(default)s)")
+    parser.add_argument("--metrics", metavar="FICHIER", help="exporter les métriques au format texte Prometheus/OpenMetrics, ex. output/linkedart.prom")
+    parser.add_argument("--profile", nargs="?", const="output/profile.pstats", metavar="FICHIER", help="profiler l'exécution (cProfile) et afficher le temps passé par étape")
+    args = parser.parse_args(argv)
+
+    LOOKUP_TIMEOUT = args.timeout
+    CROSSWALK = args.crosswalk
+    VALIDATE = args.validate
+    if args.hedge is not None:
+        HEDGED_LOOKUPS, HEDGE_PERCENTILE = True, args.hedge
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
+    # Shard : tout ce que le nœud écrit reste dans son dossier, pour être fusionné ensuite
+    shard = parse_shard(args.shard) if args.shard else None
+    output_dir = shard_dir("output", shard) if shard else "output"
+    cache_path = os.path.join(output_dir, CACHE_FILE) if shard and args.vocab_cache else args.vocab_cache
+    if shard:
+        args.report = os.path.join(output_dir, os.path.basename(args.report))
+        if args.metrics:
+            args.metrics = os.path.join(output_dir, os.path.basename(args.metrics))
+        if args.corpus:
+            args.corpus = os.path.join(output_dir, os.path.basename(args.corpus))
+
+    if args.vocab_cache and os.path.exists(args.vocab_cache):
+        vocabulary_cache.load(args.vocab_cache)
+
+    if args.checkpoint:
+        CHECKPOINT = Checkpoint(output_dir, vocabulary_cache)
+        if len(CHECKPOINT):
+            print(f"Reprise : {len(CHECKPOINT)} notices déjà transformées ({CHECKPOINT.path})")
+    if CROSSWALK:
+        prefetch_crosswalk()
+    # Entités partagées écrites au fil de l'eau (synchronisées avant la notice si --checkpoint)
+    if args.shared_nodes:
+        SHARED_NODES = SharedNodes(output_dir, sync=CHECKPOINT is not None)
+        if CHECKPOINT is not None and len(CHECKPOINT):
+            SHARED_NODES.load()
+
+    corpus = Corpus() if args.corpus else None
+    report = RunReport()
+    metrics.profiling = bool(args.profile)
+    # Reprise : rapport et corpus repartent des notices déjà journalisées
+    if CHECKPOINT is not None:
+        CHECKPOINT.restore(report, corpus)
+
+    # Dossiers écrits par les scripts de 1_Recuperation_notices
+    inputs = args.input or ["input_agorha", "input_louvre", "input_paris_musees"]
+    try:
+        process_directories([path for path in inputs if os.path.exists(path)], corpus=corpus, report=report, output_dir=output_dir, shard=shard)
+    finally:
+        # Journal synchronisé et cache enregistré même après Ctrl-C ou erreur
+        if CHECKPOINT is not None:
+            CHECKPOINT.close()
+
+    report.finish()
+    if cache_path:
+        vocabulary_cache.save(cache_path)
+    report.write_json(args.report, metrics)
+    if args.metrics:
+        report.write_prometheus(args.metrics, metrics)
+
+    if corpus is not None:
+        corpus.write_parquet(args.corpus)
+
+    if args.profile:
+        stats = metrics.dump_profile(args.profile)
+        print(metrics.summary())
+        if stats:
+            stats.sort_stats("cumulative").print_stats(20)
+
 if __name__ == "__main__":
-    process_directory_mulithread("input_agorha", create_intermediate_representation_agorha, "agorha")
-    process_directory_mulithread("input_louvre", create_intermediate_representation_louvre, "louvre")
-    process_directory_mulithread("input_parismusees", create_intermediate_representation_paris_musees, "paris_musees")
\ No newline at end of file
+    main()
@@ -0,0 +1,180 @@
+import re
+
+# Validation des objets Linked Art produits, contre un sous-ensemble du schéma JSON Linked Art.
+# Ce sous-ensemble (classes et propriétés utilisées par la transformation, forme des URI et des dates)
+# ne remplace pas les schémas officiels : un objet sans violation n'est pas pour autant conforme.
+# Le schéma est compilé une fois en fonctions imbriquées (une par mot-clé), sans interprétation
+# du schéma à chaque objet ; toutes les violations sont relevées, pas seulement la première.
+# Mots-clés pris en charge : $ref (#/definitions/…), type, const, enum, required, properties,
+# additionalProperties, items, pattern, minLength.
+
+# Classes Linked Art utilisées par la transformation
+LINKED_ART_CLASSES = (
+    "Acquisition", "Dimension", "Group", "HumanMadeObject", "Identifier", "Language", "LinguisticObject",
+    "Material", "MeasurementUnit", "Name", "Person", "Place", "Production", "Set", "TimeSpan", "Type",
+)
+
+URI = {"type": "string", "pattern": r"^https?://\S+$"}
+TEXT = {"type": "string", "minLength": 1}
+# xsd:dateTime
+DATE_TIME = {"type": "string", "pattern": r"^-?\d{4,}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:Z|[+-]\d{2}:\d{2})?$"}
+
+NODE_PROPERTIES = {
+    "id": URI,
+    "type": {"enum": list(LINKED_ART_CLASSES)},
+    "_label": TEXT,
+    "content": TEXT,
+    "notation": TEXT,
+    "value": {"type": "number"},
+    "begin_of_the_begin": DATE_TIME,
+    "end_of_the_end": DATE_TIME,
+}
+
+LINKED_ART_SCHEMA = {
+    "definitions": {
+        # Toute valeur imbriquée : jamais null ; objets et listes validés récursivement
+        "value": {
+            "type": ["object", "array", "string", "number", "boolean"],
+            "properties": NODE_PROPERTIES,
+            "additionalProperties": {"$ref": "#/definitions/value"},
+            "items": {"$ref": "#/definitions/value"},
+        },
+    },
+    "type": "object",
+    "required": ["@context", "id", "type", "_label"],
+    "properties": {**NODE_PROPERTIES, "@context": URI, "type": {"const": "HumanMadeObject"}},
+    "additionalProperties": {"$ref": "#/definitions/value"},
+}
+
+# Types JSON -> classes Python produites par le module json (bool n'est pas un nombre ici)
+_TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+# Chemin d'une valeur : (chemin parent, clé), mis en forme seulement en cas de violation
+def _format(path):
+    parts = []
+    while path is not None:
+        path, key = path
+        parts.append(f"[{key}]" if key.__class__ is int else f".{key}")
+    return "".join(reversed(parts)).lstrip(".")
+
+_ALL_CLASSES = frozenset(cls for classes in _TYPES.values() for cls in classes)
+
+def _compile(schema, root, refs):
+    # Les vérifications sont rangées par classe de valeur : une chaîne ne passe que par les
+    # mots-clés de chaîne, un objet que par ceux d'objet, etc.
+    if "$ref" in schema and len(schema) == 1:
+        return _resolve(schema["$ref"], root, refs)
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        allowed = frozenset(cls for name in names for cls in _TYPES[name])
+    else:
+        allowed = _ALL_CLASSES
+    expected = " | ".join(names) if "type" in schema else None
+    by_class = {cls: [] for cls in allowed}
+
+    def add(check, classes=_ALL_CLASSES):
+        for cls in allowed & classes:
+            by_class[cls].append(check)
+
+    if "$ref" in schema:
+        add(_resolve(schema["$ref"], root, refs))
+
+    if "const" in schema:
+        const = schema["const"]
+        def check_const(value, path, errors):
+            if value != const:
+                errors.append((_format(path), f"valeur attendue {const!r}, trouvé {value!r}"))
+        add(check_const)
+
+    if "enum" in schema:
+        allowed_values = frozenset(schema["enum"])
+        def check_enum(value, path, errors):
+            if value.__class__ is not str or value not in allowed_values:
+                errors.append((_format(path), f"valeur inconnue {value!r}"))
+        add(check_enum)
+
+    if "pattern" in schema:
+        search = re.compile(schema["pattern"]).search
+        pattern = schema["pattern"]
+        def check_pattern(value, path, errors):
+            if not search(value):
+                errors.append((_format(path), f"{value!r} ne correspond pas à {pattern}"))
+        add(check_pattern, {str})
+
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+        def check_min_length(value, path, errors):
+            if len(value) < min_length:
+                errors.append((_format(path), "chaîne vide" if min_length == 1 else f"moins de {min_length} caractères"))
+        add(check_min_length, {str})
+
+    if "required" in schema:
+        required = tuple(schema["required"])
+        def check_required(value, path, errors):
+            for key in required:
+                if key not in value:
+                    errors.append((_format((path, key)), "propriété obligatoire absente"))
+        add(check_required, {dict})
+
+    if "properties" in schema or "additionalProperties" in schema:
+        properties = {key: _compile(sub, root, refs) for key, sub in schema.get("properties", {}).items()}
+        additional = schema.get("additionalProperties", True)
+        other = _compile(additional, root, refs) if isinstance(additional, dict) else None
+        def check_properties(value, path, errors):
+            for key, item in value.items():
+                check = properties.get(key, other)
+                if check is not None:
+                    check(item, (path, key), errors)
+                elif additional is False:
+                    errors.append((_format((path, key)), "propriété non autorisée"))
+        add(check_properties, {dict})
+
+    if "items" in schema:
+        item_check = _compile(schema["items"], root, refs)
+        def check_items(value, path, errors):
+            for index, item in enumerate(value):
+                item_check(item, (path, index), errors)
+        add(check_items, {list})
+
+    table = {cls: tuple(checks) for cls, checks in by_class.items()}
+
+    def validate(value, path, errors):
+        checks = table.get(value.__class__)
+        if checks is None:
+            # Mauvais type : les autres mots-clés ne s'appliquent pas
+            errors.append((_format(path), f"type attendu {expected}, trouvé {'null' if value is None else type(value).__name__}"))
+            return
+        for check in checks:
+            check(value, path, errors)
+    return validate
+
+def _resolve(ref, root, refs):
+    if ref not in refs:
+        # Référence récursive : la fonction est enregistrée avant d'être compilée
+        cell = []
+        refs[ref] = lambda value, path, errors: cell[0](value, path, errors)
+        target = root
+        for part in ref.lstrip("#/").split("/"):
+            target = target[part]
+        cell.append(_compile(target, root, refs))
+    return refs[ref]
+
+def compile_schema(schema):
+    # Schéma -> fonction(document) renvoyant la liste des violations (chemin, message)
+    validate = _compile(schema, schema, {})
+    def validator(document):
+        errors = []
+        validate(document, None, errors)
+        return errors
+    return validator
+
+validate_linked_art = compile_schema(LINKED_ART_SCHEMA)
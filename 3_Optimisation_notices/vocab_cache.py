@@ -0,0 +1,96 @@
+import json, os, threading
+
+# Nom du fichier de cache enregistré à côté des sorties (shards, reprise)
+CACHE_FILE = "vocabulary_cache.json"
+
+# Marqueur des libellés déjà cherchés sans résultat (cache négatif)
+MISSING = object()
+
+class VocabularyCache:
+    # Cache libellé normalisé -> URI des recherches distantes (Getty / Wikidata)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, label):
+        return label in self._entries
+
+    def get(self, label):
+        # Renvoie l'URI (ou None si le libellé est connu sans résultat), MISSING sinon
+        with self._lock:
+            uri = self._entries.get(label, MISSING)
+            if uri is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return uri
+
+    def peek(self, label):
+        # Comme get(), sans compter de succès ni d'échec
+        with self._lock:
+            return self._entries.get(label, MISSING)
+
+    def uris(self):
+        with self._lock:
+            return [uri for uri in self._entries.values() if uri]
+
+    def resolve(self, label, compute):
+        # Un seul appel à compute() par libellé, même si plusieurs workers le demandent en même temps ;
+        # si compute() échoue, rien n'est mis en cache et les workers en attente réessaient.
+        while True:
+            with self._lock:
+                uri = self._entries.get(label, MISSING)
+                if uri is not MISSING:
+                    self.hits += 1
+                    return uri
+                event = self._pending.get(label)
+                owner = event is None
+                if owner:
+                    event = self._pending[label] = threading.Event()
+                    self.misses += 1
+            if not owner:
+                event.wait()
+                continue
+            try:
+                uri = compute()
+                with self._lock:
+                    self._entries[label] = uri
+                return uri
+            finally:
+                with self._lock:
+                    del self._pending[label]
+                event.set()
+
+    def put(self, label, uri):
+        with self._lock:
+            self._entries[label] = uri
+
+    def load(self, path):
+        # Entrées d'un fichier enregistré par save() (préchargement, exécution précédente) ;
+        # les entrées déjà en mémoire sont conservées
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        with self._lock:
+            for label, uri in entries.items():
+                self._entries.setdefault(label, uri)
+        return len(entries)
+
+    def save(self, path):
+        # Écriture dans un fichier temporaire puis renommage : un lecteur ne voit jamais un fichier partiel
+        with self._lock:
+            entries = dict(self._entries)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(temporary, path)
+        return len(entries)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}